@@ -0,0 +1,113 @@
+"""
+This module is the process-wide asset cache.  Every image, sound and font
+is loaded from disk once, images are converted to the display format, and
+the same Surface, Sound or Font is handed to everything that asks for it.
+
+Images need a display mode to be set before they can be converted, so
+nothing is loaded until it is first asked for.  When config.headless is
+set images are left unconverted and sounds are silent, so no display or
+mixer is needed at all.
+"""
+import os
+
+# pylint: disable=import-error
+import pygame
+
+import config
+from chuckie.thing import DIR
+
+_images = {}
+_sounds = {}
+_frame_tables = {}
+_fonts = {}
+
+
+def image(file: str, colorkey=None) -> pygame.surface.Surface:
+    """
+    Returns the shared, display-converted, Surface for an image.
+    :param file: the file name within the images directory.
+    :param colorkey: optional colour to treat as transparent.
+    """
+    key = (file, colorkey)
+    img = _images.get(key)
+    if img is None:
+        img = pygame.image.load(os.path.join('.', 'images', file))
+        if not config.headless:
+            img = img.convert()
+        if colorkey is not None:
+            img.set_colorkey(colorkey)
+        _images[key] = img
+    return img
+
+
+def frame_table(animations: dict, colorkey=None) -> dict:
+    """
+    Returns the shared frame table for a character's animations, keyed by
+    (animation, direction, frame).  The DIR.LEFT frames are mirrored copies
+    of the DIR.RIGHT ones, made once here rather than on every draw.
+    :param animations: animation name mapped to its list of image files.
+    :param colorkey: optional colour to treat as transparent.
+    """
+    key = (tuple((name, tuple(files)) for name, files in animations.items()), colorkey)
+    table = _frame_tables.get(key)
+    if table is None:
+        table = {}
+        for name, files in animations.items():
+            for frame, file in enumerate(files):
+                img = image(file, colorkey)
+                table[(name, DIR.RIGHT, frame)] = img
+                table[(name, DIR.LEFT, frame)] = pygame.transform.flip(img, True, False)
+        _frame_tables[key] = table
+    return table
+
+
+class SilentSound:
+    """
+    Stands in for a pygame.mixer.Sound when running headless.
+    """
+    def play(self, *_args, **_kwargs) -> None:
+        return
+
+    def stop(self) -> None:
+        return
+
+
+def sound(file: str) -> pygame.mixer.Sound:
+    """
+    Returns the shared Sound for a sound effect.
+    :param file: the file name within the resources directory.
+    """
+    snd = _sounds.get(file)
+    if snd is None:
+        if config.headless:
+            snd = SilentSound()
+        else:
+            snd = pygame.mixer.Sound(os.path.join('.', 'resources', file))
+        _sounds[file] = snd
+    return snd
+
+
+def font(size: int, file: str = config.font_name) -> pygame.font.Font:
+    """
+    Returns the shared Font for a size, by default the game's font.
+    :param size: point size.
+    :param file: the font file name within the resources directory.
+    """
+    key = (file, size)
+    fnt = _fonts.get(key)
+    if fnt is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        fnt = pygame.font.Font(os.path.join('.', 'resources', file), size)
+        _fonts[key] = fnt
+    return fnt
+
+
+def clear() -> None:
+    """
+    Drop every cached asset, for example after the display mode changes.
+    """
+    _images.clear()
+    _sounds.clear()
+    _frame_tables.clear()
+    _fonts.clear()
@@ -0,0 +1,182 @@
+"""
+This module runs many headless games across a pool of processes, one
+Simulation per core, and streams each game's result back as it finishes.
+It's used for balance tuning: run the same layouts with lots of seeds and
+input policies, and compare scores, eggs collected and how Harry died.
+
+    python -m chuckie.batch --games 1000 --level 2 --policy random --out results.jsonl
+
+Add --levels PACK to play the levels in a level pack, see
+chuckie/level_pack.py, instead of the ones that ship with the game.
+
+Each result is a dict:
+
+* 'seed', 'starting_level', 'policy' - from the GameSpec.
+* 'outcome' - GAME_OVER, GAME_COMPLETE or, if max_steps ran out, PLAYING.
+* 'score', 'eggs_collected', 'level_reached', 'time_remaining', 'steps'.
+* 'deaths' - the cause of each life lost, in order: 'splat' (fell or jumped
+  out of the level), 'lift' (carried off the top of the screen), 'hen' or
+  'time'.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from random import Random
+from typing import Iterable, Iterator, List
+
+import config
+from chuckie.controls import Controls
+from chuckie.level_pack import LevelPack
+
+
+class GameSpec:
+    """
+    Describes one game for the batch runner.
+    """
+    def __init__(self, seed: int, starting_level: int = config.starting_level,
+                 policy: str = 'random', level_list: List = None, max_steps: int = 100000):
+        """
+        :param seed: seeds the hens, and the 'random' policy.
+        :param starting_level: zero based index of the first level to play.
+        :param policy: 'random' to press random keys, 'idle' to press none, or
+        the path of a recording (see chuckie.replay) to play its keys.
+        :param level_list: level_data style layouts, or a
+        chuckie.level_pack.LevelPack, to play, None for the levels that ship
+        with the game.
+        :param max_steps: stop the game after this many steps.
+        """
+        self.seed = seed
+        self.starting_level = starting_level
+        self.policy = policy
+        self.level_list = level_list
+        self.max_steps = max_steps
+
+
+def _random_policy(seed: int) -> Iterator[Controls]:
+    """
+    Holds a random combination of keys down for a random number of steps.
+    """
+    rng = Random(seed)
+    ctrls = Controls()
+    ctrls.paused = False
+    while True:
+        key = rng.randrange(6)
+        hold = rng.randint(4, 16)
+        for _ in range(hold):
+            ctrls.a_down = key == 0
+            ctrls.d_down = key == 1
+            ctrls.w_down = key == 2
+            ctrls.s_down = key == 3
+            ctrls.space_down = ctrls.space_down or (key == 4 and rng.random() < 0.5)
+            yield ctrls
+
+
+def _idle_policy() -> Iterator[Controls]:
+    ctrls = Controls()
+    ctrls.paused = False
+    while True:
+        yield ctrls
+
+
+def _recorded_policy(path: str) -> Iterator[Controls]:
+    # pylint: disable=import-outside-toplevel
+    from chuckie.replay import Recording, unpack_controls
+
+    ctrls = Controls()
+    for state in Recording.load(path).states():
+        yield unpack_controls(state, ctrls)
+
+
+def _policy(spec: GameSpec) -> Iterator[Controls]:
+    if spec.policy == 'random':
+        return _random_policy(spec.seed)
+    if spec.policy == 'idle':
+        return _idle_policy()
+    return _recorded_policy(spec.policy)
+
+
+def run_game(spec: GameSpec) -> dict:
+    """
+    Play one game headless, to the end or spec.max_steps.
+    :return: the game's result dict.
+    """
+    config.headless = True
+    # pylint: disable=import-outside-toplevel
+    from chuckie.simulation import Simulation, OUTCOME
+
+    sim = Simulation(spec.starting_level, spec.level_list, seed=spec.seed)
+    deaths = []
+    outcome = OUTCOME.PLAYING
+    for ctrls in _policy(spec):
+        if sim.frame >= spec.max_steps:
+            break
+        outcome = sim.step(ctrls)
+        if outcome in (OUTCOME.DIED, OUTCOME.GAME_OVER):
+            deaths.append(sim.cause_of_death)
+        if sim.done:
+            break
+
+    return {
+        'seed': spec.seed,
+        'starting_level': spec.starting_level,
+        'policy': spec.policy,
+        'outcome': outcome.name,
+        'score': sim.status.game_score,
+        'eggs_collected': sim.eggs_collected,
+        'level_reached': min(sim.status.game_level, len(sim.levels) - 1),
+        'time_remaining': sim.status.game_time,
+        'steps': sim.frame,
+        'deaths': deaths,
+    }
+
+
+def _init_worker() -> None:
+    config.headless = True
+
+
+def run_batch(specs: Iterable[GameSpec], workers: int = None) -> Iterator[dict]:
+    """
+    Run the games across a pool of worker processes, one per core unless
+    workers says otherwise.
+    :return: an iterator of result dicts, in the order the games finish.
+    """
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker) as pool:
+        futures = [pool.submit(run_game, spec) for spec in specs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='python -m chuckie.batch',
+                                     description="Run lots of headless games.")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--level', type=int, default=config.starting_level,
+                        help="zero based index of the level to start on")
+    parser.add_argument('--levels', metavar='PACK',
+                        help="play the levels in the level pack PACK, see chuckie/level_pack.py")
+    parser.add_argument('--policy', default='random',
+                        help="'random', 'idle' or the path of a recording")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--max-steps', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', help="write results as JSON lines to this file")
+    args = parser.parse_args(argv)
+
+    levels = LevelPack(args.levels) if args.levels else None
+    specs = (GameSpec(args.seed + i, args.level, args.policy, levels, args.max_steps)
+             for i in range(args.games))
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    try:
+        for result in run_batch(specs, args.workers):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,251 @@
+"""
+This module is the micro-benchmark suite for the per-frame hot paths:
+Harry.move, Hen.move, Level.check_collision, Level.element_at,
+Level.create, Level.draw (with Level.clear) and Status.draw.
+
+Each is timed call by call on every shipped level, plus synthetic stress
+levels with lots of hens and lifts, while Harry is driven by seeded random
+key presses.  The whole suite is run a few times and, for each timing,
+the run with the lowest median is kept, to damp out noise from the rest
+of the machine.  Results are written as JSON; given a baseline file, any
+timing whose median has slowed by more than the threshold is flagged as a
+regression and the exit status is 1.
+
+    python -m chuckie.benchmark --out baseline.json
+    python -m chuckie.benchmark --out new.json --compare baseline.json
+
+The benchmark uses SDL's dummy video and audio drivers, unless told
+otherwise by SDL_VIDEODRIVER / SDL_AUDIODRIVER, so it runs on machines
+with no display.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from random import Random
+from typing import Dict, List
+
+import config
+
+OPERATIONS = ('Harry.move', 'Hen.move', 'Level.check_collision', 'Level.element_at',
+              'Level.create', 'Level.draw', 'Status.draw')
+
+
+def stress_level(hens: int = 0, lift_columns: int = 0) -> List[List[str]]:
+    """
+    Build a synthetic level_data style layout: a floor every four rows,
+    joined by ladders, with the given number of hens spread over the floors
+    and the given number of lift columns down the right hand side.  Raises
+    ValueError if the floors don't have room for that many hens.
+    """
+    layout = [[' '] * config.x_tiles for _ in range(config.y_tiles)]
+    floor_rows = list(range(4, config.y_tiles, 4))
+    right = config.x_tiles - 1 - 2 * lift_columns
+
+    for row in floor_rows:
+        for column in range(1, right):
+            layout[row][column] = 'f'
+        for column in range(3, right - 1, 6):
+            for ladder_row in range(row - 4, row + 1):
+                if ladder_row >= 0:
+                    layout[ladder_row][column + (row // 4) % 2] = 'l'
+        layout[row - 1][right - 2] = 'e'
+        layout[row - 1][2] = 'g'
+
+    for i in range(lift_columns):
+        column = right + 2 * i
+        for row in (6, 16):
+            layout[row][column] = '-l'
+            layout[row][column + 1] = '-r'
+
+    # Harry and the hens stand two rows above a floor, like the real levels.
+    harry_row = floor_rows[-1] - 2
+    harry_column = next(column for column in range(right - 4, 0, -1)
+                        if layout[harry_row][column] == layout[harry_row + 1][column] == ' ')
+    layout[harry_row][harry_column] = 'cr'
+
+    free = [[column for column in range(2, right - 2) if layout[row - 2][column] == ' '
+             and (row - 2 != harry_row or abs(column - harry_column) > 2)]
+            for row in floor_rows]
+    if hens > sum(len(columns) for columns in free):
+        raise ValueError(f"no room for {hens} hens")
+    floor = 0
+    for i in range(hens):
+        # round the floors in turn, spreading each floor's hens along it.
+        while not free[floor]:
+            floor = (floor + 1) % len(floor_rows)
+        column = free[floor].pop((len(free[floor]) * 2) // 5)
+        layout[floor_rows[floor] - 2][column] = 'hr' if i % 2 else 'hl'
+        floor = (floor + 1) % len(floor_rows)
+    return layout
+
+
+def _levels() -> Dict[str, List]:
+    # pylint: disable=import-outside-toplevel
+    from chuckie.level_data import levels
+
+    named = {f"level{i + 1}": layout for i, layout in enumerate(levels)}
+    named['stress-hens'] = stress_level(hens=40)
+    named['stress-lifts'] = stress_level(hens=8, lift_columns=4)
+    return named
+
+
+def _summary(samples: List[int]) -> dict:
+    samples = sorted(samples)
+    return {'calls': len(samples),
+            'median_ns': samples[len(samples) // 2],
+            'p95_ns': samples[min(len(samples) - 1, (len(samples) * 95) // 100)],
+            'mean_ns': sum(samples) // len(samples)}
+
+
+# pylint: disable=too-many-locals
+def bench_level(layout, frames: int, creates: int, window) -> dict:
+    """
+    Time each operation on one level.
+    :return: operation name mapped to its timing summary.
+    """
+    # pylint: disable=import-outside-toplevel
+    from chuckie.controls import Controls
+    from chuckie.level import Level
+    from chuckie.status import Status
+
+    clock = time.perf_counter_ns
+    samples = {operation: [] for operation in OPERATIONS}
+    status = Status()
+
+    for _ in range(creates):
+        start = clock()
+        level = Level(layout, status, seed=0)
+        level.create()
+        samples['Level.create'].append(clock() - start)
+
+    rng = Random(0)
+    tiles = [(rng.randrange(1, config.x_tiles + 1), rng.randrange(6, config.y_tiles + 6))
+             for _ in range(frames)]
+    ctrls = Controls()
+    ctrls.paused = False
+    level.redraw()
+    for frame in range(frames):
+        if frame % 8 == 0:
+            key = rng.randrange(6)
+            ctrls.a_down, ctrls.d_down = key == 0, key == 1
+            ctrls.w_down, ctrls.s_down = key == 2, key == 3
+            ctrls.space_down = key == 4
+
+        for hen in level.hens:
+            start = clock()
+            hen.move()
+            samples['Hen.move'].append(clock() - start)
+        level.update_lifts()
+
+        start = clock()
+        alive = level.harry.move(ctrls)
+        samples['Harry.move'].append(clock() - start)
+
+        start = clock()
+        alive = not level.check_collision() and alive
+        samples['Level.check_collision'].append(clock() - start)
+
+        start = clock()
+        level.element_at(*tiles[frame])
+        samples['Level.element_at'].append(clock() - start)
+
+        start = clock()
+        level.clear(window)
+        level.draw(window)
+        samples['Level.draw'].append(clock() - start)
+
+        start = clock()
+        status.draw(window)
+        samples['Status.draw'].append(clock() - start)
+
+        if not alive or level.check_lift_death():
+            level.reset()
+
+    return {operation: _summary(values) for operation, values in samples.items() if values}
+
+
+def run(frames: int = 2000, creates: int = 20, repeat: int = 3) -> dict:
+    """
+    Run the whole suite, repeat times, keeping the best run of each timing.
+    :return: the results, ready to be written as JSON.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # pylint: disable=import-outside-toplevel
+    import pygame
+
+    window = pygame.display.set_mode([config.window_width, config.window_height])
+    pygame.init()
+    pygame.mixer.init()
+
+    results = {}
+    for _ in range(repeat):
+        for name, layout in _levels().items():
+            for operation, summary in bench_level(layout, frames, creates, window).items():
+                key = f"{name}/{operation}"
+                if key not in results or summary['median_ns'] < results[key]['median_ns']:
+                    results[key] = summary
+
+    return {'meta': {'python': platform.python_version(),
+                     'pygame': pygame.version.ver,
+                     'platform': platform.platform(),
+                     'frames': frames,
+                     'creates': creates,
+                     'repeat': repeat},
+            'results': results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Compare median timings against a baseline.
+    :param threshold: the fraction a median may slow down by, e.g. 0.1.
+    :return: a line for each regression.
+    """
+    regressions = []
+    for key, summary in sorted(current['results'].items()):
+        base = baseline['results'].get(key)
+        if not base or not base['median_ns']:
+            continue
+        change = (summary['median_ns'] - base['median_ns']) / base['median_ns']
+        line = f"{key:40} {base['median_ns']:>10} -> {summary['median_ns']:>10} ns  {change:+.1%}"
+        if change > threshold:
+            regressions.append(line)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m chuckie.benchmark',
+                                     description="Time the per-frame hot paths.")
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="fraction a median may slow by before it's a regression")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--creates', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = run(args.frames, args.creates, args.repeat)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    if not args.out:
+        json.dump(results, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
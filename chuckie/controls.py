@@ -1,12 +1,48 @@
 """
 This module represents the user's key presses within the game.
+
+Key events are dispatched through KEY_ACTIONS, and timestamped as they're
+taken from the queue.  A key pressed and released between two simulation
+steps still counts as held for the next step, so a quick tap is never
+lost, and each press is timed until the frame showing its result is on
+screen, giving the input latency.
 """
 import sys
+from time import perf_counter
 
 # pylint: disable=import-error
 import pygame
 
 import config
+from chuckie import profiler
+
+INPUT_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+""" The only event types the game uses, see allow_input_events(). """
+
+KEY_ACTIONS = {
+    ord('w'): 'up',
+    ord('s'): 'down',
+    ord('a'): 'left',
+    ord('d'): 'right',
+    pygame.K_SPACE: 'jump',
+    ord('p'): 'pause',
+    pygame.K_ESCAPE: 'pause',
+    pygame.K_F3: 'frame_times',
+    pygame.K_F4: 'profile',
+}
+""" The action each key performs. """
+
+HELD_ACTIONS = {'up': 'w_down', 'down': 's_down', 'left': 'a_down', 'right': 'd_down'}
+""" Actions that last while their key is held, and the attribute they set. """
+
+
+def allow_input_events() -> None:
+    """
+    Have pygame drop every event type except INPUT_EVENTS as it arrives,
+    rather than queue it for the game to skip over.
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(INPUT_EVENTS))
 
 
 class Controls:
@@ -14,8 +50,6 @@ class Controls:
     Class to collate key presses and key releases.
     """
 
-    HALF_SECOND_TICK = pygame.USEREVENT+1
-
     def __init__(self):
         self.a_down = False
         self.d_down = False
@@ -24,6 +58,10 @@ class Controls:
         self.space_down = False
         self.paused = config.start_paused
         self.quit = False
+        self._unstepped = set()
+        self._releases = set()
+        self._pressed_at = []
+        self._stepped_at = []
 
     def __str__(self):
         status = "["
@@ -37,16 +75,24 @@ class Controls:
         status += "]"
         return f"{status}, space={self.space_down}, paused={self.paused}"
 
-    # pylint: disable=too-many-branches
-    def process_events(self, tick_handler) -> None:
+    def process_events(self, events: list = None, now: float = None, timed: bool = True) -> None:
         """
         Function used to capture the state of the keypresses, for when needed
-        by Harry, HighScores, or main game loop.
-        This method captures the 500ms tick, that is used to manage the game
-        time counter.
-        :param tick_handler: handler for the status.update() routine.
+        by Harry, or the main game loop.
+        Game time is counted by the Simulation's fixed-timestep clock, not by
+        events.
+        :param events: the events to process, by default those waiting in
+        pygame's queue.
+        :param now: the perf_counter() time the events were taken from the
+        queue, by default now.
+        :param timed: False to leave these presses out of the input latency,
+        for a screen where they can't take effect straight away.
         """
-        for event in pygame.event.get():
+        if not timed:
+            now = None
+        elif now is None:
+            now = perf_counter()
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 try:
@@ -54,31 +100,64 @@ class Controls:
                 finally:
                     self.quit = True
 
-            if event.type == Controls.HALF_SECOND_TICK and tick_handler:
-                tick_handler(self.paused)
+            action = KEY_ACTIONS.get(getattr(event, 'key', None))
+            if action is None:
+                continue
 
             if event.type == pygame.KEYDOWN:
-                if event.key == ord('p') or event.key == pygame.K_ESCAPE \
-                        or (event.key == ord('s') and not tick_handler):
-                    self.paused = not self.paused
-                    print(f"paused {self.paused}")
-                if event.key == ord('w'):
-                    self.w_down = True
-                if event.key == ord('s'):
-                    self.s_down = True
-                if event.key == ord('a'):
-                    self.a_down = True
-                if event.key == ord('d'):
-                    self.d_down = True
-                if event.key == pygame.K_SPACE:
-                    self.space_down = True
-
-            if event.type == pygame.KEYUP:
-                if event.key == ord('w'):
-                    self.w_down = False
-                if event.key == ord('s'):
-                    self.s_down = False
-                if event.key == ord('a'):
-                    self.a_down = False
-                if event.key == ord('d'):
-                    self.d_down = False
+                self._press(action, now)
+            elif event.type == pygame.KEYUP and action in HELD_ACTIONS:
+                # if the key hasn't been seen by a step yet, hold it for one.
+                attribute = HELD_ACTIONS[action]
+                if attribute in self._unstepped:
+                    self._releases.add(attribute)
+                else:
+                    setattr(self, attribute, False)
+
+    def _press(self, action: str, now: float = None) -> None:
+        """
+        :param now: when the press was taken from the queue, None if it
+        isn't timed.
+        """
+        if now is not None and (action in HELD_ACTIONS or action == 'jump'):
+            self._pressed_at.append(now)
+        if action in HELD_ACTIONS:
+            attribute = HELD_ACTIONS[action]
+            setattr(self, attribute, True)
+            self._unstepped.add(attribute)
+            self._releases.discard(attribute)
+        elif action == 'jump':
+            # space stays down until Harry jumps, he clears it.
+            self.space_down = True
+        elif action == 'pause':
+            self.paused = not self.paused
+            print(f"paused {self.paused}")
+        elif action == 'frame_times':
+            config.show_frame_times = not config.show_frame_times
+        elif action == 'profile':
+            profiler.toggle()
+
+    def stepped(self) -> None:
+        """
+        Call after each simulation step has read the controls: keys tapped
+        before the step are released, and presses it has seen are timed
+        until they are presented().
+        """
+        for attribute in self._releases:
+            setattr(self, attribute, False)
+        self._releases.clear()
+        self._unstepped.clear()
+        self._stepped_at += self._pressed_at
+        self._pressed_at.clear()
+
+    def presented(self, now: float = None) -> list:
+        """
+        Call once a frame is on screen.
+        :param now: the perf_counter() time it was presented, by default now.
+        :return: the latency in ms, from being taken from the queue to being
+        on screen, of each press first shown in this frame.
+        """
+        now = perf_counter() if now is None else now
+        latencies = [(now - pressed) * 1000 for pressed in self._stepped_at]
+        self._stepped_at.clear()
+        return latencies
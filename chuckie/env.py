@@ -0,0 +1,248 @@
+"""
+This module wraps the headless Simulation in a Gym-style environment, for
+training agents: reset(seed) starts a game, step(action) plays one frame.
+
+Observations are NumPy arrays that the environment owns and overwrites in
+place on every step, nothing is allocated or copied per step; copy them if
+they need to outlive the next step.  They are:
+
+* 'tiles' - uint8 [22, 22], the level layout in level_data order (row,
+  column), using the chuckie.level_pack.TILE codes of the floors, ladders,
+  eggs and grain; everything else is TILE.EMPTY.  Only updated when an egg
+  or grain is consumed, or a new level is loaded.
+* 'harry' - float32 [4], column, row, STATE value and DIR value.
+* 'hens' - float32 [max_hens, 3], column, row and DIR value of each hen,
+  unused rows are -1.
+* 'lifts' - float32 [max_lifts, 2], column and row of each lift, unused
+  rows are -1.
+
+Positions are the top left corner of the sprite in tile units, in the same
+coordinates as the 'tiles' grid.
+
+With pixels=True, 'pixels' is also given; a pygame.surfarray.pixels3d view
+[width, height, 3] of the surface the level is drawn on.  While that view
+is alive the surface is locked, so it must be dropped before the next step.
+
+VectorEnv steps N independent games in one call, each writing into its
+own slice of the batched arrays.
+
+Set config.headless to True before creating an environment, as for a
+Simulation; ChuckieEnv raises RuntimeError if it isn't.  It's left to the
+caller because it's global: any window in the same process would stop
+baking its backgrounds and go silent, and images already loaded keep
+whatever conversion they were loaded with.
+
+This module needs numpy, which the game itself does not.
+"""
+from typing import List, Sequence
+
+# pylint: disable=import-error
+import numpy as np
+import pygame
+
+import config
+from chuckie.controls import Controls
+from chuckie.simulation import Simulation, OUTCOME
+from chuckie.level import Level
+from chuckie.level_pack import MOVEABLES, TILE, TILE_NAMES
+
+# the 'tiles' code for each TILE, the moveables are left out.
+_STATIC_TILES = np.array([TILE.EMPTY if code in MOVEABLES else code
+                          for code in range(len(TILE_NAMES))], np.uint8)
+
+NOOP, LEFT, RIGHT, UP, DOWN, JUMP, JUMP_LEFT, JUMP_RIGHT = range(8)
+ACTIONS = 8
+
+# the keys held down for each action: a, d, w, s, space.
+_ACTION_KEYS = {
+    NOOP: (False, False, False, False, False),
+    LEFT: (True, False, False, False, False),
+    RIGHT: (False, True, False, False, False),
+    UP: (False, False, True, False, False),
+    DOWN: (False, False, False, True, False),
+    JUMP: (False, False, False, False, True),
+    JUMP_LEFT: (True, False, False, False, True),
+    JUMP_RIGHT: (False, True, False, False, True),
+}
+
+
+class ChuckieEnv:
+    """
+    A single game of Chuckie Egg.  The reward for a step is the change in
+    score; an episode ends when the game is over or every level is done.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, starting_level: int = config.starting_level, pixels: bool = False,
+                 max_hens: int = 16, max_lifts: int = 16, buffers: dict = None):
+        """
+        :param starting_level: zero based index of the level to start on.
+        :param pixels: if True, draw the game and give a pixel view of it.
+        :param max_hens: rows in the 'hens' observation.
+        :param max_lifts: rows in the 'lifts' observation.
+        :param buffers: optional arrays to write the observations into, as
+        used by VectorEnv; any missing are allocated.
+        """
+        if not config.headless:
+            raise RuntimeError("set config.headless to True before creating a ChuckieEnv")
+        self.starting_level = starting_level
+        self.pixels = pixels
+        buffers = buffers or {}
+        self.tiles = buffers.get('tiles', np.zeros((config.y_tiles, config.x_tiles), np.uint8))
+        self.harry = buffers.get('harry', np.zeros(4, np.float32))
+        self.hens = buffers.get('hens', np.full((max_hens, 3), -1, np.float32))
+        self.lifts = buffers.get('lifts', np.full((max_lifts, 2), -1, np.float32))
+        self.obs = {'tiles': self.tiles, 'harry': self.harry, 'hens': self.hens, 'lifts': self.lifts}
+
+        self.sim = None
+        self.ctrls = Controls()
+        self.ctrls.paused = False
+        self._level = None
+        self._consumables = []
+        self._elements_left = 0
+        self._surface = None
+
+    def reset(self, seed: int = None) -> dict:
+        """
+        Start a new game.
+        :param seed: seed for the hens, None for a random game.
+        :return: the first observation.
+        """
+        self.sim = Simulation(self.starting_level, seed=seed)
+        self.ctrls = Controls()
+        self.ctrls.paused = False
+        self._level = None
+        self._observe()
+        return self.obs
+
+    def step(self, action: int):
+        """
+        Play one frame, with the keys for action held down.
+        :return: observation, reward, done and an info dict.
+        """
+        ctrls = self.ctrls
+        ctrls.a_down, ctrls.d_down, ctrls.w_down, ctrls.s_down, space = _ACTION_KEYS[action]
+        ctrls.space_down = ctrls.space_down or space
+
+        score = self.sim.status.game_score
+        outcome = self.sim.step(ctrls)
+        self._observe()
+
+        done = outcome in (OUTCOME.GAME_OVER, OUTCOME.GAME_COMPLETE)
+        info = {'outcome': outcome, 'cause_of_death': self.sim.cause_of_death,
+                'level': self.sim.status.game_level, 'lives': self.sim.status.game_lives}
+        return self.obs, self.sim.status.game_score - score, done, info
+
+    def _observe(self) -> None:
+        level = self.sim.level
+        if level is not self._level:
+            self._load_tiles(level)
+        elif len(level.elements) != self._elements_left:
+            self._update_consumed(level)
+
+        harry = level.harry
+        self.harry[0] = harry.x / config.tile_width - 1
+        self.harry[1] = harry.y / config.tile_height - 6
+        self.harry[2] = harry.state.value
+        self.harry[3] = harry.direction.value
+
+        _write_positions(level.hens, self.hens, with_direction=True)
+        _write_positions(level.lifts, self.lifts, with_direction=False)
+
+        if self.pixels:
+            self._draw(level)
+
+    def _load_tiles(self, level: Level) -> None:
+        self._level = level
+        data = level.data
+        tiles = np.frombuffer(data.tiles, np.uint8).reshape(data.height, data.width)
+        np.take(_STATIC_TILES, tiles, out=self.tiles)
+        self._consumables = []
+        for code, row, column in data.statics:
+            if code in (TILE.EGG, TILE.GRAIN):
+                x, y = Level.grid_to_tile(row, column)
+                self._consumables.append((x * config.tile_width, y * config.tile_height, row, column))
+        self._elements_left = len(level.elements)
+
+        if self.pixels:
+            level.bake_background()
+
+    def _update_consumed(self, level: Level) -> None:
+        remaining = []
+        for consumable in self._consumables:
+            real_x, real_y, row, column = consumable
+            if level.static_at(real_x, real_y) is None:
+                self.tiles[row, column] = TILE.EMPTY
+            else:
+                remaining.append(consumable)
+        self._consumables = remaining
+        self._elements_left = len(level.elements)
+
+    def _draw(self, level: Level) -> None:
+        if self._surface is None:
+            self._surface = pygame.Surface((config.window_width, config.window_height), 0, 24)
+        self.obs.pop('pixels', None)
+        level.clear(self._surface)
+        self.sim.status.draw(self._surface)
+        level.draw(self._surface)
+        self.obs['pixels'] = pygame.surfarray.pixels3d(self._surface)
+
+
+def _write_positions(things, out: np.ndarray, with_direction: bool) -> None:
+    """
+    Write the tile unit positions of a group of moveables into the rows of
+    out, marking any rows left over as unused.
+    """
+    count = 0
+    for thing in things:
+        if count == len(out):
+            break
+        out[count, 0] = thing.x / config.tile_width - 1
+        out[count, 1] = thing.y / config.tile_height - 6
+        if with_direction:
+            out[count, 2] = thing.direction.value
+        count += 1
+    out[count:] = -1
+
+
+class VectorEnv:
+    """
+    N independent games stepped together.  Games that finish are reset
+    straight away, with a fresh random seed, and report done for that step.
+    """
+    def __init__(self, n: int, starting_level: int = config.starting_level,
+                 max_hens: int = 16, max_lifts: int = 16):
+        self.n = n
+        self.tiles = np.zeros((n, config.y_tiles, config.x_tiles), np.uint8)
+        self.harry = np.zeros((n, 4), np.float32)
+        self.hens = np.full((n, max_hens, 3), -1, np.float32)
+        self.lifts = np.full((n, max_lifts, 2), -1, np.float32)
+        self.rewards = np.zeros(n, np.int32)
+        self.dones = np.zeros(n, np.bool_)
+        self.obs = {'tiles': self.tiles, 'harry': self.harry, 'hens': self.hens, 'lifts': self.lifts}
+        self.envs: List[ChuckieEnv] = [
+            ChuckieEnv(starting_level, buffers={'tiles': self.tiles[i], 'harry': self.harry[i],
+                                                'hens': self.hens[i], 'lifts': self.lifts[i]})
+            for i in range(n)]
+
+    def reset(self, seeds: Sequence[int] = None) -> dict:
+        for i, env in enumerate(self.envs):
+            env.reset(seeds[i] if seeds is not None else None)
+        return self.obs
+
+    def step(self, actions: Sequence[int]):
+        """
+        Play one frame in every game.
+        :param actions: one action per game.
+        :return: observations, rewards and dones, batched along the first
+        axis, and a list of info dicts.
+        """
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, reward, done, info = env.step(actions[i])
+            self.rewards[i] = reward
+            self.dones[i] = done
+            if done:
+                info['final_score'] = env.sim.status.game_score
+                env.reset()
+            infos.append(info)
+        return self.obs, self.rewards, self.dones, infos
@@ -0,0 +1,174 @@
+"""
+This module records how long each phase of the main loop takes, frame by
+frame, so dropped frames can be pinned on a subsystem without attaching a
+profiler.
+
+The phases, in the order they happen within a frame, are:
+
+* 'events' - Controls.process_events().
+* 'hens_lifts' - moving the hens and the lifts, for every step this frame.
+* 'harry' - Harry.move(), for every step this frame.
+* 'collisions' - the lift, hen and time-up checks, for every step.
+* 'level_draw' - Level.clear() and Level.draw().
+* 'hud_draw' - Status.draw().
+* 'present' - pushing the dirty rects to the display, and Clock.tick().
+
+The last config.frame_times_history frames are kept in a ring buffer, one
+per phase, plus the frame's 'total'.  Alongside them are the latencies of
+the last presses of Harry's keys, from being taken off the event queue to
+the frame showing their result being on screen, as 'input'.
+
+Press F3 to show p50/p99 of each on screen; run with --frame-times FILE to
+write every frame still in the buffer to a .csv or .json file at exit.
+"""
+import json
+from array import array
+from time import perf_counter
+
+# pylint: disable=import-error
+import pygame
+
+import config
+from chuckie import assets
+
+PHASES = ('events', 'hens_lifts', 'harry', 'collisions', 'level_draw', 'hud_draw', 'present')
+COLUMNS = PHASES + ('total',)
+
+
+class NullTimer:
+    """
+    Stands in for a FrameTimer when nothing is being timed, so the
+    Simulation can mark its phases without checking.
+    """
+    def lap(self, phase: str) -> None:
+        pass
+
+
+class FrameTimer:
+    """
+    Times the phases of each frame, in milliseconds.
+    """
+    OVERLAY_REFRESH = 15
+    """ The overlay is re-rendered every this many frames. """
+
+    def __init__(self, size: int = config.frame_times_history):
+        """
+        :param size: the number of frames kept.
+        """
+        self.size = size
+        self.frames = 0
+        self._samples = {column: array('d', bytes(8 * size)) for column in COLUMNS}
+        self.inputs = 0
+        self._inputs = array('d', bytes(8 * size))
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._mark = perf_counter()
+        self._overlay = None
+        self._overlay_pos = (0, 0)
+
+    def start(self) -> None:
+        """
+        Throw away the time of the frame so far, for example after a screen
+        that has been waiting on its own.
+        """
+        for phase in PHASES:
+            self._current[phase] = 0.0
+        self._mark = perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """
+        Charge the time since the last lap to phase.
+        """
+        now = perf_counter()
+        self._current[phase] += (now - self._mark) * 1000
+        self._mark = now
+
+    def end_frame(self) -> None:
+        """
+        Store this frame's times in the ring buffer, and start the next.
+        """
+        slot = self.frames % self.size
+        total = 0.0
+        for phase in PHASES:
+            self._samples[phase][slot] = self._current[phase]
+            total += self._current[phase]
+            self._current[phase] = 0.0
+        self._samples['total'][slot] = total
+        self.frames += 1
+
+    def record_input(self, latency: float) -> None:
+        """
+        Store the latency of a key press, in ms.
+        """
+        self._inputs[self.inputs % self.size] = latency
+        self.inputs += 1
+
+    def _ring(self, column: str):
+        if column == 'input':
+            return self._inputs, self.inputs
+        return self._samples[column], self.frames
+
+    def samples(self, column: str) -> list:
+        """
+        The times held for a phase, 'total' or 'input', oldest first.
+        """
+        values, count = self._ring(column)
+        if count <= self.size:
+            return values[:count].tolist()
+        slot = count % self.size
+        return values[slot:].tolist() + values[:slot].tolist()
+
+    def percentile(self, column: str, pct: float) -> float:
+        values, count = self._ring(column)
+        values = sorted(values[:min(count, self.size)])
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+    def summary(self) -> dict:
+        """
+        :return: p50, p99 and max of each phase, the total and the input
+        latency, in ms.
+        """
+        return {column: {'p50': self.percentile(column, 50),
+                         'p99': self.percentile(column, 99),
+                         'max': self.percentile(column, 100)}
+                for column in COLUMNS + ('input',)}
+
+    def draw(self, window: pygame.Surface) -> list:
+        """
+        Draw the p50/p99 overlay in the top right corner of the window.
+        :return: the list of rects that changed.
+        """
+        if self._overlay is None or self.frames % FrameTimer.OVERLAY_REFRESH == 0:
+            self._overlay = self._render_overlay()
+            self._overlay_pos = (window.get_width() - self._overlay.get_width(), 0)
+        return [window.blit(self._overlay, self._overlay_pos)]
+
+    def _render_overlay(self) -> pygame.Surface:
+        font = assets.font(16)
+        lines = [f"{'phase':<11}{'p50':>7}{'p99':>7}"]
+        for column, times in self.summary().items():
+            lines.append(f"{column:<11}{times['p50']:>7.2f}{times['p99']:>7.2f}")
+
+        rendered = [font.render(line, False, (0, 255, 0)) for line in lines]
+        surface = pygame.Surface((max(line.get_width() for line in rendered) + 8,
+                                  len(rendered) * font.get_linesize() + 8))
+        for i, line in enumerate(rendered):
+            surface.blit(line, (4, 4 + i * font.get_linesize()))
+        return surface
+
+    def export(self, path: str) -> None:
+        """
+        Write the buffered frames to path, as JSON if it ends '.json',
+        otherwise as CSV with one row per frame.
+        """
+        columns = {column: self.samples(column) for column in COLUMNS}
+        with open(path, 'w', encoding='utf-8') as file:
+            if path.endswith('.json'):
+                json.dump({'frames': self.frames, 'summary': self.summary(), 'samples': columns,
+                           'input': self.samples('input')}, file, indent=2)
+                return
+
+            file.write(','.join(COLUMNS) + '\n')
+            for row in zip(*columns.values()):
+                file.write(','.join(f"{value:.4f}" for value in row) + '\n')
@@ -2,13 +2,9 @@
 This module contains the Harry class, which represents the main
 playable character - Hen-House Harry.
 """
-import os
-
-# pylint: disable=import-error
-import pygame
-
 import chuckie.utils as utils
 import config
+from chuckie import assets
 from chuckie.controls import Controls
 from chuckie.thing import Thing, DIR, STATE
 from config import gravity, tile_width, jump_height
@@ -31,17 +27,16 @@ class Harry(Thing):
     def __init__(self, level, start_tile_x: int, start_tile_y: int, start_direction: DIR):
         super().__init__('harry', level, start_tile_x, start_tile_y, start_direction)
 
-        self.images_left_right = []
-        self.images_up_down = []
-        self.image = self._load_images(os.path.join('.', 'images', 'harry-debug.png'))
+        self.frames = {}
+        self.image = self._load_images('harry-debug.png')
         self.init_rect(self.image)
 
-        self.step = pygame.mixer.Sound(os.path.join('.', 'resources', 'step.wav'))
-        self.jump = pygame.mixer.Sound(os.path.join('.', 'resources', 'jump.wav'))
-        self.fall = pygame.mixer.Sound(os.path.join('.', 'resources', 'fall.wav'))
-        self.egg = pygame.mixer.Sound(os.path.join('.', 'resources', 'egg.wav'))
-        self.grain = pygame.mixer.Sound(os.path.join('.', 'resources', 'grain.wav'))
-        self.ladder = pygame.mixer.Sound(os.path.join('.', 'resources', 'ladder.wav'))
+        self.step = assets.sound('step.wav')
+        self.jump = assets.sound('jump.wav')
+        self.fall = assets.sound('fall.wav')
+        self.egg = assets.sound('egg.wav')
+        self.grain = assets.sound('grain.wav')
+        self.ladder = assets.sound('ladder.wav')
 
         if config.debug_harry:
             print(f"putting harry at [{start_tile_x}, {start_tile_y}]")
@@ -50,29 +45,36 @@ class Harry(Thing):
         self.on_lift = False
         self.draw()
 
+    def reset(self) -> None:
+        """
+        Put Harry back to his starting position, standing still.
+        """
+        super().reset()
+        self.image = self.frames[('walk', DIR.RIGHT, 0)]
+        self.state = STATE.STILL
+        self.on_lift = False
+        self.draw()
+
     def _load_images(self, file: str):
         """
-        Internal function to load the sprites from their image files.
-        :param file: path to the debug image, if debug_display is True.
+        Internal function to load the sprites from their image files, into
+        a frame table keyed by (animation, direction, frame).
+        :param file: name of the debug image, if debug_display is True.
         :return: the first (default) image to draw on creation.
         """
+        animations = {'walk': [], 'ladder': []}
         for i in range(1, 5):
             if not config.debug_display:
-                file = os.path.join('.', 'images', 'harry-' + str(i) + '.png')
-            img = pygame.image.load(file).convert()
-            img.convert_alpha()
-            img.set_colorkey((0, 0, 0))
-            self.images_left_right.append(img)
+                file = 'harry-' + str(i) + '.png'
+            animations['walk'].append(file)
 
         for i in range(1, 5):
             if not config.debug_display:
-                file = os.path.join('.', 'images', 'harry-ladder-' + str(i) + '.png')
-            img = pygame.image.load(file).convert()
-            img.convert_alpha()
-            img.set_colorkey((0, 0, 0))
-            self.images_up_down.append(img)
+                file = 'harry-ladder-' + str(i) + '.png'
+            animations['ladder'].append(file)
 
-        return self.images_left_right[0]
+        self.frames = assets.frame_table(animations, (0, 0, 0))
+        return self.frames[('walk', DIR.RIGHT, 0)]
 
     def __str__(self):
         return f"{super().__str__()}, y_velocity={self.y_velocity}, " \
@@ -98,9 +100,9 @@ class Harry(Thing):
         # pylint: disable=useless-return
         def by_deltas():
             if self.is_going_right():
-                self.image = self.images_left_right[self.frame]
+                self.image = self.frames[('walk', DIR.RIGHT, self.frame)]
             elif self.is_going_left():
-                self.image = pygame.transform.flip(self.images_left_right[self.frame], True, False)
+                self.image = self.frames[('walk', DIR.LEFT, self.frame)]
             return
 
         if self.state == STATE.STILL or self.state == STATE.JUMP or self.state == STATE.FALLING:
@@ -111,15 +113,15 @@ class Harry(Thing):
                     # only play the step noise, if Harry is actually moving.
                     # if he moves sideways on the lift, his state is set to WALKING.
                     self.step.play()
-                self.image = self.images_left_right[self.frame]
+                self.image = self.frames[('walk', DIR.RIGHT, self.frame)]
             elif self.direction == DIR.LEFT:
                 if self.is_going_left():
                     # see comment above.
                     self.step.play()
-                self.image = pygame.transform.flip(self.images_left_right[self.frame], True, False)
+                self.image = self.frames[('walk', DIR.LEFT, self.frame)]
             elif (self.direction == DIR.UP or self.direction == DIR.DOWN) and self.dy != 0:
                 self.ladder.play()
-                self.image = self.images_up_down[self.frame]
+                self.image = self.frames[('ladder', DIR.RIGHT, self.frame)]
             else:
                 by_deltas()
 
@@ -160,77 +162,12 @@ class Harry(Thing):
             self.y_velocity = jump_height
             self.dy = self.y_velocity
 
-    # pylint: disable=too-many-locals
     def get_possible_moves(self):
         """
         Returns a list of bools, that denote if Harry can go
         up, down, left or right, in that order.
         """
-        moves = [False, False, False, False]
-
-        items = self.level.all_landables()
-        above_tile = utils.tile_to_real(self.tx, self.ty-2)
-        above_tile_element = next(iter([r.name for r in items
-                                        if r.rect.collidepoint(above_tile)]), "")
-
-        current_tile = utils.tile_to_real(self.tx, self.ty)
-        current_element = next(iter([r.name for r in items if
-                                     r.rect.collidepoint(current_tile)]), "")
-
-        under_foot = utils.tile_to_real(self.tx, self.ty+1)
-        under_foot_element = next(iter([r.name for r in items
-                                        if r.rect.collidepoint(under_foot)]), "")
-
-        left = utils.tile_to_real(self.tx-1, self.ty)
-        left_element = next(iter([r.name for r in items
-                                  if r.rect.collidepoint(left)]), "")
-
-        under_left = utils.tile_to_real(self.tx-1, self.ty+1)
-        under_left_element = next(iter([r.name for r in items
-                                        if r.rect.collidepoint(under_left)]), "")
-
-        right = utils.tile_to_real(self.tx+1, self.ty)
-        right_element = next(iter([r.name for r in items
-                                   if r.rect.collidepoint(right)]), "")
-
-        under_right = utils.tile_to_real(self.tx+1, self.ty+1)
-        under_right_element = next(iter([r.name for r in items
-                                         if r.rect.collidepoint(under_right)]), "")
-
-        def not_landable(element):
-            return element in ('', 'grain', 'egg')
-
-        # allow go-up if above tile is a ladder
-        if above_tile_element == 'ladder':
-            moves[0] = True
-
-        # allow go-down if the underneath tile is a ladder.
-        if under_foot_element == 'ladder':
-            moves[1] = True
-
-        # if we're on a ladder, moving sideways isn't allowed, unless we're on
-        # a landable-ladder tile (i.e. one flanked by 'floor' tiles).
-        if current_element == 'ladder':
-            if under_left_element == 'floor':
-                moves[2] = True
-            if under_right_element == 'floor':
-                moves[3] = True
-
-            if under_left_element == 'floor' and not_landable(under_right_element):
-                moves[3] = True
-            if under_right_element == 'floor' and not_landable(under_left_element):
-                moves[2] = True
-        else:
-            # if we're not on a ladder, so we can go left or right unless
-            # there's a step in the way.
-            moves[2] = True
-            moves[3] = True
-            if left_element == 'floor':
-                moves[2] = False
-            if right_element == 'floor':
-                moves[3] = False
-
-        return moves
+        return self.level.harry_moves(self.tx, self.ty)
 
     def check_can_move_sideways(self) -> bool:
         """
@@ -334,14 +271,14 @@ class Harry(Thing):
 
         # rect won't have been updated yet, as draw() hasn't been called.
         point = self.rect.midbottom[0] + self.dx, self.rect.midbottom[1] + self.dy
-        obj = next(iter([r for r in self.level.elements if r.rect.collidepoint(point)]), None)
+        obj = self.level.static_at(*point)
         if obj and obj.name == 'floor':
             self._snap(obj)
             return
 
         if obj and obj.name == 'ladder':
             a, b = utils.real_to_tile(obj.rect.x, obj.rect.y)
-            if self.level.element_at(a-1, b) == 'floor' or self.level.element_at(a+1, b) == 'floor':
+            if self.level.is_landable_ladder(a, b):
                 self._snap(obj)
         return
 
@@ -383,16 +320,14 @@ class Harry(Thing):
 
         # have we hit the edge of a floor-tile? in which case bounce!
         midpoint = self.rect.centerx + self.dx, self.rect.centery + self.dy
-        mid = next(iter([r for r in self.level.all_landables()
-                         if r.rect.collidepoint(midpoint)]), None)
+        mid = self.level.landable_at(*midpoint)
         if self.is_going_down() and mid and mid.name == 'floor':
             self._bounce()
             return
 
         # has Harry landed on a floor 'tile'?
         mid_bottom = self.rect.midbottom[0] + self.dx, self.rect.midbottom[1] + self.dy
-        below = next(iter([r for r in self.level.all_landables()
-                           if r.rect.collidepoint(mid_bottom)]), None)
+        below = self.level.landable_at(*mid_bottom)
         if self.is_going_down() and below and below.name == 'floor':
             self._snap(below)
             return
@@ -408,8 +343,7 @@ class Harry(Thing):
         # has Harry landed on a landable-ladder tile?
         if self.is_going_down() and below and below.name == 'ladder':
             a, b = utils.real_to_tile(below.rect.x, below.rect.y)
-            if self.level.element_at(a-1, b) == 'floor' \
-                    or self.level.element_at(a+1, b) == 'floor':
+            if self.level.is_landable_ladder(a, b):
                 self._snap(below)
                 return
 
@@ -417,8 +351,7 @@ class Harry(Thing):
             # is Harry jumping through a ladder? should he grab it?
             # for level 6, Harry needs to grab a ladder at head level.
             mid_top = self.rect.midtop[0] + self.dx, self.rect.midtop[1] + self.dy
-            top = next(iter([r for r in self.level.all_landables()
-                             if r.rect.collidepoint(mid_top)]), None)
+            top = self.level.landable_at(*mid_top)
             if (below and below.name == 'ladder') or (top and top.name == 'ladder'):
                 self.x = below.rect.x if below else top.rect.x
                 self.y = below.rect.y - self.rect.height if below else top.rect.y
@@ -456,8 +389,7 @@ class Harry(Thing):
         but rect won't have as we haven't called draw() yet...
         """
         point = self.rect.midbottom[0] + self.dx, self.rect.midbottom[1] + 1
-        lift = next(iter([r for r in self.level.all_landables()
-                          if r.rect.collidepoint(point) and r.name == 'lift']), None)
+        lift = self.level.lift_at(*point)
         if lift is None:
             return
 
@@ -481,8 +413,7 @@ class Harry(Thing):
         updated but rect won't have as we haven't called draw() yet...
         """
         lower_tile = utils.tile_to_real(self.tx, self.ty + 1)
-        tile = next(iter([r for r in self.level.all_landables()
-                          if r.rect.collidepoint(lower_tile)]), None)
+        tile = self.level.landable_at(*lower_tile)
         if not tile or (tile.name != 'floor' and tile.name != 'ladder'):
             if utils.left_edge_of_block(self.x):
                 self._fall()
@@ -560,8 +491,7 @@ class Harry(Thing):
             return False
 
         # check for any consumables!
-        element = next(iter([r for r in self.level.elements
-                             if r.rect.colliderect(self.rect)]), None)
+        element = self.level.static_colliding(self.rect)
         if element and element.name == 'egg':
             self.level.consume_egg(element)
             self.egg.play()
@@ -2,7 +2,6 @@
 This module contains the Hen class, which represents the strange
 Emu-look-a-like hens that walk the platforms.
 """
-import os
 from random import Random
 from typing import List
 
@@ -11,6 +10,7 @@ import pygame
 
 import chuckie.utils as utils
 import config
+from chuckie import assets
 from chuckie.thing import Thing, STATE, DIR
 
 
@@ -23,13 +23,12 @@ class Hen(Thing):
     """
 
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, level, start_tile_x, start_tile_y, direction: DIR):
+    def __init__(self, level, start_tile_x, start_tile_y, direction: DIR, rng: Random):
         super().__init__('hen', level, start_tile_x, start_tile_y, direction)
 
-        self.images_left_right = []
-        self.images_eating = []
-        self.images_up_down = []
-        self.image = self._load_images(os.path.join('.', 'images', 'hen-debug.png'))
+        self.frames = {}
+        self.frame_count = 4
+        self.image = self._load_images('hen-debug.png')
         self.init_rect(self.image)
 
         if config.debug_hens:
@@ -39,8 +38,9 @@ class Hen(Thing):
         """ self.previous is used ensure the Hens keep moving the same
         direction after a ladder. """
 
-        self.random = Random()
-        self.random.seed()
+        self.random = rng
+        """ self.random is the level's random stream, shared by all its hens,
+        so a seeded level always plays out the same way. """
         self.actions = [self.update_up, self.update_down, self.update_left, self.update_right]
         """ self.actions is an array of 'move' functions, up, down, left and
         right """
@@ -48,39 +48,39 @@ class Hen(Thing):
         if config.debug_hens:
             self.dump_state()
 
+    def reset(self) -> None:
+        """
+        Put the Hen back to her starting position and direction.
+        """
+        super().reset()
+        self.image = self.frames[('walk', DIR.RIGHT, 0)]
+        self.previous = self.direction
+
     def _load_images(self, file: str) -> pygame.surface.Surface:
         """
-        Internal function to load the sprites from their image files.
-        :param file: path to the debug image, if debug_display is True.
+        Internal function to load the sprites from their image files, into
+        a frame table keyed by (animation, direction, frame).
+        :param file: name of the debug image, if debug_display is True.
         :return: the first (default) image to draw on creation.
         """
-        for i in range(1, 5):
+        animations = {'walk': [], 'eating': [], 'ladder': []}
+        for i in range(1, self.frame_count + 1):
             if not config.debug_display:
-                file = os.path.join('.', 'images', 'hen-' + str(i) + '.png')
-            img = pygame.image.load(file).convert()
-            img.convert_alpha()
-            img.set_colorkey((0, 0, 0))
-            self.images_left_right.append(img)
-
-        self.images_eating = []
-        for i in range(1, 5):
+                file = 'hen-' + str(i) + '.png'
+            animations['walk'].append(file)
+
+        for i in range(1, self.frame_count + 1):
             if not config.debug_display:
-                file = os.path.join('.', 'images', 'hen-eating-' + str(i) + '.png')
-            img = pygame.image.load(file).convert()
-            img.convert_alpha()
-            img.set_colorkey((0, 0, 0))
-            self.images_eating.append(img)
-
-        self.images_up_down = []
-        for i in range(1, 5):
+                file = 'hen-eating-' + str(i) + '.png'
+            animations['eating'].append(file)
+
+        for i in range(1, self.frame_count + 1):
             if not config.debug_display:
-                file = os.path.join('.', 'images', 'hen-ladder-' + str(i) + '.png')
-            img = pygame.image.load(file).convert()
-            img.convert_alpha()
-            img.set_colorkey((0, 0, 0))
-            self.images_up_down.append(img)
+                file = 'hen-ladder-' + str(i) + '.png'
+            animations['ladder'].append(file)
 
-        return self.images_left_right[0]
+        self.frames = assets.frame_table(animations, (0, 0, 0))
+        return self.frames[('walk', DIR.RIGHT, 0)]
 
     def __str__(self):
         return "[hen" + str(id(self))[-2:] + "]" + super().__str__()[5:]
@@ -91,7 +91,7 @@ class Hen(Thing):
         four for eating, and four more for going up and down.
         """
         self.frame += 1
-        if self.frame == len(self.images_left_right):
+        if self.frame == self.frame_count:
             self.frame = 0
 
         # all hen images are three tiles wide, adjust x to compensate.
@@ -99,16 +99,11 @@ class Hen(Thing):
         self.rect.y = self.y
 
         if self.direction == DIR.UP or self.direction == DIR.DOWN:
-            self.image = self.images_up_down[self.frame]
+            self.image = self.frames[('ladder', DIR.RIGHT, self.frame)]
             return
 
-        if self.state == STATE.EATING:
-            self.image = self.images_eating[self.frame]
-        else:
-            self.image = self.images_left_right[self.frame]
-
-        if self.direction == DIR.LEFT:
-            self.image = pygame.transform.flip(self.image, True, False)
+        animation = 'eating' if self.state == STATE.EATING else 'walk'
+        self.image = self.frames[(animation, self.direction, self.frame)]
 
     def choose(self, options) -> int:
         """
@@ -158,33 +153,7 @@ class Hen(Thing):
         Returns a list of bools, that denote if a Hen can go
         up, down, left or right, in that order.
         """
-        moves = [False, False, False, False]
-
-        above_pt = utils.tile_to_real(self.tx, self.ty - 2)
-        above_element = next(iter([r.name for r in self.level.elements
-                                   if r.rect.collidepoint(above_pt)]), None)
-
-        under_pt = utils.tile_to_real(self.tx, self.ty + 1)
-        under_element = next(iter([r.name for r in self.level.elements
-                                   if r.rect.collidepoint(under_pt)]), None)
-
-        left_pt = utils.tile_to_real(self.tx - 1, self.ty + 1)
-        under_lf_element = next(iter([r.name for r in self.level.elements
-                                      if r.rect.collidepoint(left_pt)]), None)
-
-        right_pt = utils.tile_to_real(self.tx + 1, self.ty + 1)
-        under_rt_element = next(iter([r.name for r in self.level.elements
-                                      if r.rect.collidepoint(right_pt)]), None)
-
-        if above_element == 'ladder':
-            moves[0] = True
-        if under_element == 'ladder':
-            moves[1] = True
-        if under_lf_element in ('floor', 'ladder'):
-            moves[2] = True
-        if under_rt_element in ('floor', 'ladder'):
-            moves[3] = True
-        return moves
+        return self.level.hen_moves(self.tx, self.ty)
 
     # pylint: disable=invalid-name
     # ^^^ it doesn't like tx
@@ -196,8 +165,7 @@ class Hen(Thing):
         """
         tx = self.tx - 1 if self.is_going_left() else self.tx + 1
         next_tile = utils.tile_to_real(tx, self.ty)
-        next_element = next(iter([r for r in self.level.elements
-                                  if r.rect.collidepoint(next_tile)]), None)
+        next_element = self.level.static_at(*next_tile)
         if next_element and next_element.name == 'grain':
             self.level.consume_grain(next_element, hen_mode=True)
             self.dx = 0
@@ -1,18 +1,17 @@
 """
 
 """
-import os
-
 import pygame
 
 import config
+from chuckie import assets
 
 
 class Egg(pygame.sprite.Sprite):
 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(os.path.join('.', 'images', 'egg.png')).convert()
+        self.image = assets.image('egg.png')
         self.rect = self.image.get_rect()
         self.rect.x = x * config.tile_width
         self.rect.y = y * config.tile_height
@@ -24,7 +23,7 @@ class Grain(pygame.sprite.Sprite):
 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(os.path.join('.', 'images', 'grain.png')).convert()
+        self.image = assets.image('grain.png')
         self.rect = self.image.get_rect()
         self.rect.x = x * config.tile_width
         self.rect.y = y * config.tile_height
@@ -36,7 +35,7 @@ class Floor(pygame.sprite.Sprite):
 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(os.path.join('.', 'images', 'floor.png')).convert()
+        self.image = assets.image('floor.png')
         self.rect = self.image.get_rect()
         self.rect.x = x * config.tile_width
         self.rect.y = y * config.tile_height
@@ -48,7 +47,7 @@ class Ladder(pygame.sprite.Sprite):
 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(os.path.join('.', 'images', 'ladder.png')).convert()
+        self.image = assets.image('ladder.png')
         self.rect = self.image.get_rect()
         self.rect.x = x * config.tile_width
         self.rect.y = y * config.tile_height
@@ -0,0 +1,106 @@
+"""
+This module contains the Leaderboard class, a table of scores kept sorted
+best first as they're added, and Leaderboards, an all-time board plus one
+board per level reached.
+
+Each board keeps a sorted list of integer keys alongside its entries, the
+negated score in the high bits and the order it was added in the low bits,
+so finding where a score goes is a bisect, O(log n), whatever the size of
+the board.  Equal scores are kept in the order they were added: the first
+to get a score stays ahead of everyone who matches it later.
+"""
+from bisect import bisect_left
+from itertools import count
+from typing import Iterable, List, Optional, Tuple
+
+Entry = Tuple[str, int, Optional[int]]
+""" name, score and the (zero based) level reached, None if not known. """
+
+_SEQUENCE_BITS = 40
+
+
+class Leaderboard:
+    """
+    Scores, best first.
+    """
+    def __init__(self, entries: Iterable[Entry] = ()):
+        """
+        :param entries: entries to start with, in the order they were added.
+        """
+        entries = list(entries)
+        order = sorted(range(len(entries)), key=lambda i: -entries[i][1])
+        self._keys = [Leaderboard._key(entries[i][1], i) for i in order]
+        self._entries: List[Entry] = [entries[i] for i in order]
+        self._sequence = count(len(entries))
+
+    @staticmethod
+    def _key(score: int, sequence: int) -> int:
+        return (-score << _SEQUENCE_BITS) + sequence
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, name: str, score: int, level: int = None) -> int:
+        """
+        Add a score, behind any equal scores already on the board.
+        :return: its rank, 1 for the best.
+        """
+        key = Leaderboard._key(score, next(self._sequence))
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._entries.insert(index, (name, score, level))
+        return index + 1
+
+    def rank(self, score: int) -> int:
+        """
+        :return: the rank score would get if it were added now, 1 for the best.
+        """
+        return bisect_left(self._keys, Leaderboard._key(score - 1, 0)) + 1
+
+    def page(self, number: int, size: int = 10) -> List[Tuple[int, str, int]]:
+        """
+        :param number: zero based page number.
+        :param size: entries per page.
+        :return: the page's (rank, name, score) entries.
+        """
+        start = number * size
+        return [(start + i + 1, name, score)
+                for i, (name, score, _) in enumerate(self._entries[start:start + size])]
+
+    def score_at(self, rank: int) -> Optional[int]:
+        """
+        :return: the score at a rank, or None if the board's not that long.
+        """
+        return self._entries[rank - 1][1] if 0 < rank <= len(self._entries) else None
+
+
+class Leaderboards:
+    """
+    The all-time board, and a board for each level reached.
+    """
+    def __init__(self, entries: Iterable[Entry] = ()):
+        """
+        :param entries: entries to start with, in the order they were added.
+        """
+        entries = list(entries)
+        self.all_time = Leaderboard(entries)
+        by_level = {}
+        for entry in entries:
+            if entry[2] is not None:
+                by_level.setdefault(entry[2], []).append(entry)
+        self._levels = {level: Leaderboard(level_entries) for level, level_entries in by_level.items()}
+
+    def add(self, name: str, score: int, level: int = None) -> int:
+        """
+        Add a score to the all-time board, and its level's board.
+        :return: its all-time rank.
+        """
+        if level is not None:
+            self._levels.setdefault(level, Leaderboard()).add(name, score, level)
+        return self.all_time.add(name, score, level)
+
+    def level(self, level: int) -> Leaderboard:
+        """
+        :return: the board of scores that reached level, empty if there are none.
+        """
+        return self._levels.get(level) or Leaderboard()
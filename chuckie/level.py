@@ -1,5 +1,6 @@
+from random import Random
+
 import pygame
-import os
 
 import config
 from chuckie.thing import DIR
@@ -7,8 +8,10 @@ from chuckie.hen import Hen
 from chuckie.harry import Harry
 from chuckie.lift import Lift
 from chuckie.status import Status
+import chuckie.navigation as navigation
 import chuckie.utils as utils
 from chuckie.layout_elements import Egg, Grain, Floor, Ladder
+from chuckie.level_pack import TILE, compiled
 
 
 class Level:
@@ -22,17 +25,31 @@ class Level:
     condition).
     """
 
-    def __init__(self, level_data, status: Status):
-        self.data = level_data
+    def __init__(self, level_data, status: Status, seed=None):
+        """
+        :param level_data: the 22x22 layout of the level, or the
+        CompiledLevel of one.
+        :param status: the game's Status, it isn't touched until the level
+        is played, so a level can be built while another is being played.
+        :param seed: seed for the hens' random stream, None to use
+        config.random_seed.
+        """
+        self.data = compiled(level_data)
+        self.random = Random(seed if seed is not None else config.random_seed)
         self.status = status
-        self.status.reset_new_level()
         self.tiles = {}
         self.elements = pygame.sprite.Group()
         self.handles = {}
-        self._harrys = pygame.sprite.Group()
+        self._grid = Level._empty_grid()
+        self._lift_columns = {}
+        self._navigation = None
+        self._harrys = pygame.sprite.RenderUpdates()
         self._harry = None
-        self._hens = pygame.sprite.Group()
-        self._lifts = pygame.sprite.Group()
+        self._hens = pygame.sprite.RenderUpdates()
+        self._lifts = pygame.sprite.RenderUpdates()
+        self._background = None
+        self._background_dirty = []
+        self._redraw = True
         self.level_egg_count = 0
         self.eggs_collected = 0
         return
@@ -45,58 +62,99 @@ class Level:
     def harry(self) -> Harry:
         return self._harry
 
+    @property
+    def hens(self) -> pygame.sprite.Group:
+        return self._hens
+
+    @property
+    def lifts(self) -> pygame.sprite.Group:
+        return self._lifts
+
     @staticmethod
     def grid_to_tile(a, b):
         return b + 1, a + 6
 
+    @staticmethod
+    def _empty_grid():
+        """
+        The tile index, a dense 2d array of static elements indexed as
+        [ty][tx], sized so every tile produced by grid_to_tile() fits.
+        """
+        width, height = Level.grid_to_tile(config.y_tiles, config.x_tiles)
+        return [[None] * width for _ in range(height)]
+
+    def _spawn_hen(self, x, y, direction):
+        self._hens.add(Hen(self, x-1, y, direction, self.random))
+
+    def _spawn_harry(self, x, y, direction):
+        self._harry = Harry(self, x, y, direction)
+        self._harrys.add(self._harry)
+
+    def _spawn_lift(self, x, y, direction):
+        self._lifts.add(Lift(self, x, y, direction))
+
+    _STATICS = {TILE.EGG: Egg, TILE.GRAIN: Grain, TILE.LADDER: Ladder, TILE.FLOOR: Floor}
+    """ The sprite class for each static tile. """
+
+    _SPAWNERS = {TILE.HEN_LEFT: (_spawn_hen, DIR.LEFT), TILE.HEN_RIGHT: (_spawn_hen, DIR.RIGHT),
+                 TILE.HARRY_LEFT: (_spawn_harry, DIR.LEFT), TILE.HARRY_RIGHT: (_spawn_harry, DIR.RIGHT),
+                 TILE.LIFT_LEFT: (_spawn_lift, DIR.LEFT), TILE.LIFT_RIGHT: (_spawn_lift, DIR.RIGHT)}
+    """ The method that creates each moveable, and the way it faces. """
+
     def create(self):
         """
         Create the level based on the data passed in on the initialiser.
-        Items are created as they are found.  Moving/Movable objects are
-        assigned to member variables, other objects are held by handles.
-        """
-        for a in reversed(range(0, config.y_tiles)):
-            for b in reversed(range(0, config.x_tiles)):
-                element = self.data[a][b]
-                (x, y) = Level.grid_to_tile(a, b)
-
-                handle = None
-                label = None
-
-                if element == 'e':
-                    handle, label = (Egg(x, y), "egg")
-                    self.level_egg_count += 1
-                elif element == 'g':
-                    handle, label = (Grain(x, y), "grain")
-                elif element == 'l':
-                    handle, label = (Ladder(x, y), "ladder")
-                elif element == 'f':
-                    handle, label = (Floor(x, y), "floor")
-                elif element == 'hl':
-                    self._hens.add(Hen(self, x-1, y, DIR.LEFT))
-                elif element == 'hr':
-                    self._hens.add(Hen(self, x-1, y, DIR.RIGHT))
-                elif element == 'cl':
-                    self._harry = Harry(self, x, y, DIR.LEFT)
-                    self._harrys.add(self._harry)
-                elif element == 'cr':
-                    self._harry = Harry(self, x, y, DIR.RIGHT)
-                    self._harrys.add(self._harry)
-                elif element == '-l':
-                    self._lifts.add(Lift(self, x, y, DIR.LEFT))
-                elif element == '-r':
-                    self._lifts.add(Lift(self, x, y, DIR.RIGHT))
-
-                if handle:
-                    self.elements.add(handle)
-                    self.handles[(x, y)] = handle
-                if label:
-                    self.tiles[(x, y)] = label
+        Only the compiled level's non-empty cells are visited, bottom-right
+        first.  Moving/Movable objects are assigned to member variables,
+        other objects are held by handles.
+        """
+        for code, a, b in self.data.statics:
+            (x, y) = Level.grid_to_tile(a, b)
+            handle = Level._STATICS[code](x, y)
+            self.elements.add(handle)
+            self.handles[(x, y)] = handle
+            self._grid[y][x] = handle
+            self.tiles[(x, y)] = handle.name
+        self.level_egg_count += self.data.egg_count
+
+        for code, a, b in self.data.spawns:
+            spawner, direction = Level._SPAWNERS[code]
+            spawner(self, *Level.grid_to_tile(a, b), direction)
+
+        self._index_lifts()
+        # the table only depends on the static tiles, build it once per
+        # compiled level and share it.
+        if self.data.navigation is None:
+            self.data.navigation = navigation.NavigationTable(len(self._grid[0]), len(self._grid),
+                                                              self._static_name_at)
+        self._navigation = self.data.navigation
+
+        if not config.headless:
+            self.bake_background()
+        return
 
+    def bake_background(self):
+        """
+        Floors, ladders, eggs and grain never move, so render them once into
+        the background layer that clear() copies from.
+        """
+        self._background = pygame.Surface((config.window_width, config.window_height))
+        if pygame.display.get_surface() is not None:
+            self._background = self._background.convert()
+        self._background.fill([0, 0, 0])
+        self.elements.draw(self._background)
+        self._redraw = True
         return
 
-    def all_landables(self):
-        return self._lifts.sprites() + self.elements.sprites()
+    def _index_lifts(self):
+        """
+        Lifts move, so they can't live in the tile index, but they never
+        change column; keep them in a per-column lookup instead.
+        """
+        self._lift_columns = {}
+        for lift in self._lifts:
+            self._lift_columns.setdefault(lift.rect.x // config.tile_width, []).append(lift)
+        return
 
     def update_hens(self, tick: bool):
         hen: Hen
@@ -111,13 +169,87 @@ class Level:
             lift.move()
         return
 
-    def draw(self, display: pygame.display):
-        self.elements.draw(display)
-        self._hens.draw(display)
-        self._lifts.draw(display)
-        self._harrys.draw(display)
+    def redraw(self):
+        """
+        Called when something else has painted over the window, so the next
+        clear() repaints the whole background.
+        """
+        self._redraw = True
+        return
+
+    def clear(self, display: pygame.Surface) -> list:
+        """
+        Erase the moveables from where they were last drawn, and any eggs or
+        grain consumed since, by copying back from the background layer.
+        :return: the list of rects that changed.
+        """
+        if self._redraw:
+            self._redraw = False
+            self._background_dirty = []
+            display.blit(self._background, (0, 0))
+            # that painted over the HUD too.
+            self.status.redraw()
+            return [display.get_rect()]
+
+        dirty = self._background_dirty
+        self._background_dirty = []
+        for rect in dirty:
+            display.blit(self._background, rect, rect)
+
+        self._hens.clear(display, self._background)
+        self._lifts.clear(display, self._background)
+        self._harrys.clear(display, self._background)
+        return dirty
+
+    def snapshot(self):
+        """
+        Remember where each moveable is, before a simulation step moves
+        them, so draw() can interpolate between the two.
+        """
+        for group in (self._hens, self._lifts, self._harrys):
+            for thing in group:
+                thing.previous_xy = (thing.rect.x, thing.rect.y)
         return
 
+    def draw(self, display: pygame.Surface, alpha: float = 1.0) -> list:
+        """
+        Draw the moveables over the background, clear() must have been
+        called first.
+        :param alpha: how far between the previous and current simulation
+        step to draw the moveables, 1.0 being where they are now.
+        :return: the list of rects that changed.
+        """
+        dirty = []
+        for group in (self._hens, self._lifts, self._harrys):
+            if alpha >= 1.0:
+                dirty += group.draw(display)
+                continue
+
+            # draw at the interpolated position, then put the rects back,
+            # the game logic relies on them.
+            actual = {}
+            for thing in group:
+                actual[thing] = (thing.rect.x, thing.rect.y)
+                thing.rect.x, thing.rect.y = Level._interpolate(thing, alpha)
+            dirty += group.draw(display)
+            for thing, (x, y) in actual.items():
+                thing.rect.x, thing.rect.y = x, y
+        return dirty
+
+    @staticmethod
+    def _interpolate(thing, alpha: float):
+        """
+        Work out where to draw a moveable between simulation steps.  Big
+        jumps (a lift wrapping round, or a reset) aren't interpolated.
+        """
+        x, y = thing.rect.x, thing.rect.y
+        if thing.previous_xy is None:
+            return x, y
+        px, py = thing.previous_xy
+        if abs(x - px) > config.tile_width or abs(y - py) > 2 * config.tile_height:
+            return x, y
+        return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
     def reset(self):
         """
         Called when Harry has died.
@@ -126,6 +258,7 @@ class Level:
         """
         self._reset_moveables()
         self.status.reset_time()
+        self.redraw()
         return
 
     def unload(self):
@@ -162,34 +295,15 @@ class Level:
 
     def _reset_moveables(self):
         """
-        Clear, delete and then recreate the movables:
-           Harry, the hens and the lifts.
+        Put the movables: Harry, the hens and the lifts, back to their
+        starting positions.  They are created once, in create(), and reused.
         """
-        self._unload_moveables()
-
-        self._harrys = pygame.sprite.Group()
-        self._hens = pygame.sprite.Group()
-        self._lifts = pygame.sprite.Group()
-
-        for a in reversed(range(0, 22)):
-            for b in reversed(range(0, 22)):
-                element = self.data[a][b]
-                x, y = Level.grid_to_tile(a, b)
-
-                if element == 'hl':
-                    self._hens.add(Hen(self, x, y, DIR.LEFT))
-                elif element == 'hr':
-                    self._hens.add(Hen(self, x, y, DIR.RIGHT))
-                elif element == 'cl':
-                    self._harry = Harry(self, x, y, DIR.LEFT)
-                    self._harrys.add(self._harry)
-                elif element == 'cr':
-                    self._harry = Harry(self, x, y, DIR.RIGHT)
-                    self._harrys.add(self._harry)
-                elif element == '-l':
-                    self._lifts.add(Lift(self, x, y, DIR.LEFT))
-                elif element == '-r':
-                    self._lifts.add(Lift(self, x, y, DIR.RIGHT))
+        for harry in self._harrys:
+            harry.reset()
+        for hen in self._hens:
+            hen.reset()
+        for lift in self._lifts:
+            lift.reset()
         return
 
     # -------------------------------------------------------------------------
@@ -207,9 +321,11 @@ class Level:
         egg = self.handles[(tx, ty)]
         egg.kill()
         self.elements.remove(egg)
+        self._erase_from_background(egg.rect)
         del egg
         del self.handles[(tx, ty)]
         del self.tiles[(tx, ty)]
+        self._grid[ty][tx] = None
         return
 
     def consume_grain(self, _grain, hen_mode=False):
@@ -224,9 +340,18 @@ class Level:
         grain = self.handles[(tx, ty)]
         grain.kill()
         self.elements.remove(grain)
+        self._erase_from_background(grain.rect)
         del grain
         del self.handles[(tx, ty)]
         del self.tiles[(tx, ty)]
+        self._grid[ty][tx] = None
+        return
+
+    def _erase_from_background(self, rect: pygame.Rect):
+        if self._background is None:
+            return
+        self._background.fill([0, 0, 0], rect)
+        self._background_dirty.append(rect.copy())
         return
 
     def are_all_eggs_collected(self):
@@ -285,9 +410,104 @@ class Level:
     # -------------------------------------------------------------------------
 
     def element_at(self, tx, ty) -> str:
-        pt = utils.tile_to_real(tx, ty)
-        element = next(iter([r.name for r in self.all_landables() if r.rect.collidepoint(pt)]), None)
-        return element
+        """
+        Name of the landable (lift first, then static element) at the
+        top-left corner of tile (tx, ty), or None.
+        """
+        landable = self.landable_at(*utils.tile_to_real(tx, ty))
+        return landable.name if landable else None
+
+    def _static_name_at(self, tx, ty) -> str:
+        if 0 <= ty < len(self._grid) and 0 <= tx < len(self._grid[ty]):
+            element = self._grid[ty][tx]
+            return element.name if element else None
+        return None
+
+    def _use_navigation(self, tx, ty) -> bool:
+        """
+        The navigation table ignores lifts, so it can only answer for tiles
+        within the level that have no lift column alongside.
+        """
+        return self._navigation.contains(tx, ty) \
+            and tx - 1 not in self._lift_columns \
+            and tx not in self._lift_columns \
+            and tx + 1 not in self._lift_columns
+
+    def harry_moves(self, tx, ty):
+        """
+        Returns a list of bools, that denote if Harry can go up, down, left
+        or right from tile (tx, ty), in that order.
+        """
+        tx, ty = int(tx), int(ty)
+        if self._use_navigation(tx, ty):
+            return list(self._navigation.harry[ty][tx])
+        return list(navigation.harry_moves(self.element_at, tx, ty))
+
+    def hen_moves(self, tx, ty):
+        """
+        Returns a list of bools, that denote if a Hen can go up, down, left
+        or right from tile (tx, ty), in that order.  Hens ignore lifts.
+        """
+        tx, ty = int(tx), int(ty)
+        if self._navigation.contains(tx, ty):
+            return list(self._navigation.hen[ty][tx])
+        return list(navigation.hen_moves(self._static_name_at, tx, ty))
+
+    def is_landable_ladder(self, tx, ty) -> bool:
+        """
+        True if tile (tx, ty) is flanked by a floor tile, so Harry can land
+        on the ladder there.
+        """
+        tx, ty = int(tx), int(ty)
+        if self._use_navigation(tx, ty):
+            return self._navigation.landable_ladder[ty][tx]
+        return navigation.is_landable_ladder(self.element_at, tx, ty)
+
+    def static_at(self, real_x, real_y):
+        """
+        The floor, ladder, egg or grain sprite at the given point, or None.
+        This is an O(1) lookup into the tile index.
+        """
+        tx = int(real_x) // config.tile_width
+        ty = int(real_y) // config.tile_height
+        if 0 <= ty < len(self._grid) and 0 <= tx < len(self._grid[ty]):
+            return self._grid[ty][tx]
+        return None
+
+    def lift_at(self, real_x, real_y):
+        """
+        The lift at the given point, or None.  Only the lifts in the
+        point's column are checked.
+        """
+        column = self._lift_columns.get(int(real_x) // config.tile_width)
+        if column:
+            for lift in column:
+                if lift.rect.collidepoint(real_x, real_y):
+                    return lift
+        return None
+
+    def landable_at(self, real_x, real_y):
+        """
+        The sprite Harry could land on at the given point, lifts take
+        priority over static elements, or None.
+        """
+        return self.lift_at(real_x, real_y) or self.static_at(real_x, real_y)
+
+    def static_colliding(self, rect: pygame.Rect):
+        """
+        The first static element overlapping the rect, or None.  Tiles are
+        visited bottom-right first, the same order create() adds them.
+        """
+        left = int(rect.left) // config.tile_width
+        right = int(rect.right - 1) // config.tile_width
+        top = int(rect.top) // config.tile_height
+        bottom = int(rect.bottom - 1) // config.tile_height
+        for ty in range(bottom, top - 1, -1):
+            for tx in range(right, left - 1, -1):
+                element = self.static_at(tx * config.tile_width, ty * config.tile_height)
+                if element and element.rect.colliderect(rect):
+                    return element
+        return None
 
     @staticmethod
     def is_outside_playable_area(thing):
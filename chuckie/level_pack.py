@@ -0,0 +1,279 @@
+"""
+This module reads and writes level packs: many levels in one file, one
+byte per tile, read through mmap so opening a pack of thousands of levels
+costs next to nothing and only the levels played are ever decoded.
+
+The format, all little-endian:
+
+    magic 'CHKP', version (u8), width (u8), height (u8), pad (u8), count (u32)
+    index: count entries of offset (u32), length (u32), from the file's start
+    levels: width * height tile bytes each, row by row, in level_data order
+
+Each tile byte is a TILE value.  Levels are played from a CompiledLevel:
+the tile bytes in an array('B'), plus the non-empty cells listed once, in
+the order Level.create() adds them, so building or resetting a level never
+walks the whole grid.  compiled() compiles a level_data style layout, and
+caches the result; a LevelPack is a sequence of CompiledLevels, built
+straight from the bytes, so it can be handed to a Simulation as its
+level_list.
+
+    python -m chuckie.level_pack build my_levels.chkp [level.json ...]
+    python -m chuckie.level_pack list my_levels.chkp
+
+build packs the given JSON files, each a level_data style list of rows,
+or the levels that ship with the game if none are given.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from enum import IntEnum
+from threading import Lock
+from typing import List, Sequence, Tuple
+
+import config
+
+MAGIC = b'CHKP'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBxI')
+INDEX_ENTRY = struct.Struct('<II')
+
+
+class TILE(IntEnum):
+    """
+    The byte stored for each level_data tile.
+    """
+    EMPTY = 0
+    FLOOR = 1
+    LADDER = 2
+    EGG = 3
+    GRAIN = 4
+    HEN_LEFT = 5
+    HEN_RIGHT = 6
+    HARRY_LEFT = 7
+    HARRY_RIGHT = 8
+    LIFT_LEFT = 9
+    LIFT_RIGHT = 10
+
+
+TILE_NAMES = (' ', 'f', 'l', 'e', 'g', 'hl', 'hr', 'cl', 'cr', '-l', '-r')
+""" The level_data string for each TILE, indexed by value. """
+
+TILE_CODES = {name: TILE(code) for code, name in enumerate(TILE_NAMES)}
+""" The TILE for each level_data string. """
+
+MOVEABLES = frozenset((TILE.HEN_LEFT, TILE.HEN_RIGHT, TILE.HARRY_LEFT, TILE.HARRY_RIGHT,
+                       TILE.LIFT_LEFT, TILE.LIFT_RIGHT))
+
+Cell = Tuple[TILE, int, int]
+""" A tile's code, and its row and column in the layout. """
+
+
+def encode(level_data: Sequence[Sequence[str]]) -> bytes:
+    """
+    :return: the tile bytes of a level_data style layout.
+    """
+    try:
+        return bytes(TILE_CODES[tile] for row in level_data for tile in row)
+    except KeyError as error:
+        raise ValueError(f"unknown tile {error.args[0]!r}") from None
+
+
+def decode(tiles: bytes, width: int = config.x_tiles) -> List[List[str]]:
+    """
+    :return: the level_data style layout of tile bytes.
+    """
+    try:
+        names = [TILE_NAMES[code] for code in tiles]
+    except IndexError:
+        raise ValueError("unknown tile code") from None
+    return [names[row:row + width] for row in range(0, len(names), width)]
+
+
+class CompiledLevel:
+    """
+    A level's tiles, one byte each, and its non-empty cells, split into
+    the static elements and the moveables' spawn points.
+    """
+    def __init__(self, tiles: bytes, width: int = config.x_tiles):
+        """
+        :param tiles: the tile bytes, row by row.
+        :param width: the tiles in a row.
+        """
+        self.width = width
+        self.height = len(tiles) // width
+        self.tiles = array('B', tiles)
+        if self.tiles and max(self.tiles) >= len(TILE_NAMES):
+            raise ValueError("unknown tile code")
+
+        self.statics: List[Cell] = []
+        """ self.statics are the floors, ladders, eggs and grain. """
+        self.spawns: List[Cell] = []
+        """ self.spawns are where Harry, the hens and the lifts start. """
+        # bottom right first, the order the level has always been built in.
+        for index in reversed(range(len(self.tiles))):
+            code = self.tiles[index]
+            if code:
+                cell = (TILE(code), index // width, index % width)
+                (self.spawns if code in MOVEABLES else self.statics).append(cell)
+        self.egg_count = self.tiles.count(TILE.EGG)
+        self.navigation = None
+        """ self.navigation is the level's NavigationTable, built by the first
+        Level created from it. """
+
+    def layout(self) -> List[List[str]]:
+        """
+        :return: the level_data style layout.
+        """
+        return decode(self.tiles.tobytes(), self.width)
+
+
+_CACHE_SIZE = 64
+_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def compiled(level) -> CompiledLevel:
+    """
+    :param level: a level_data style layout, or a CompiledLevel.
+    :return: the compiled level.  The last _CACHE_SIZE layouts compiled
+    are cached, so each is only compiled once, as long as it isn't changed.
+    """
+    if isinstance(level, CompiledLevel):
+        return level
+    with _cache_lock:
+        # the cache holds the layout too, so its id can't be reused.
+        entry = _cache.get(id(level))
+        if entry is not None:
+            _cache.move_to_end(id(level))
+            return entry[1]
+
+    result = CompiledLevel(encode(level), len(level[0]))
+    with _cache_lock:
+        _cache[id(level)] = (level, result)
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+class LevelPack:
+    """
+    A level pack file, mapped into memory.  Indexing it compiles just that
+    level, the first time it's asked for.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._data) < HEADER.size:
+            raise ValueError(f"{path} is not a ChuckieEgg level pack")
+        magic, version, self.width, self.height, self._count = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a ChuckieEgg level pack")
+        if (self.width, self.height) != (config.x_tiles, config.y_tiles):
+            raise ValueError(f"{path} is not a ChuckieEgg level pack of "
+                             f"{config.x_tiles}x{config.y_tiles} levels")
+        if HEADER.size + self._count * INDEX_ENTRY.size > len(self._data):
+            raise ValueError(f"{path} is truncated")
+        self._compiled = {}
+        self._digest = None
+
+    def __getstate__(self):
+        # the mapping can't be pickled, worker processes map the file again.
+        return self.path
+
+    def __setstate__(self, path: str):
+        self.__init__(path)
+
+    def __len__(self):
+        return self._count
+
+    def digest(self) -> bytes:
+        """
+        :return: the SHA-256 of the whole pack, to tell if it's changed.
+        """
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._data).digest()
+        return self._digest
+
+    def tiles(self, index: int) -> bytes:
+        """
+        :param index: zero based index of the level, 0 <= index < len(self).
+        :return: the tile bytes of a level, one per tile, row by row.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError("level pack index out of range")
+        offset, length = INDEX_ENTRY.unpack_from(self._data,
+                                                 HEADER.size + index * INDEX_ENTRY.size)
+        if length != self.width * self.height or offset + length > len(self._data):
+            raise ValueError(f"{self.path} level {index} is corrupt")
+        return self._data[offset:offset + length]
+
+    def __getitem__(self, index: int) -> CompiledLevel:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("level pack index out of range")
+        level = self._compiled.get(index)
+        if level is None:
+            level = self._compiled[index] = CompiledLevel(self.tiles(index), self.width)
+        return level
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def write(path: str, layouts: Sequence[Sequence[Sequence[str]]]) -> None:
+    """
+    Write layouts, or CompiledLevels, to a new level pack, replacing path
+    only once it's all written.
+    """
+    levels = [layout.tiles.tobytes() if isinstance(layout, CompiledLevel) else encode(layout)
+              for layout in layouts]
+    size = config.x_tiles * config.y_tiles
+    for i, level in enumerate(levels):
+        if len(level) != size:
+            raise ValueError(f"level {i} is not {config.x_tiles}x{config.y_tiles}")
+
+    offset = HEADER.size + len(levels) * INDEX_ENTRY.size
+    temp = path + '.tmp'
+    with open(temp, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, config.x_tiles, config.y_tiles, len(levels)))
+        for i in range(len(levels)):
+            file.write(INDEX_ENTRY.pack(offset + i * size, size))
+        for level in levels:
+            file.write(level)
+    os.replace(temp, path)
+
+
+def main(argv: List[str]) -> None:
+    """
+    python -m chuckie.level_pack build PACK [LEVEL.json ...] | list PACK
+    """
+    command, path, files = argv[0], argv[1], argv[2:]
+    if command == 'build':
+        if files:
+            layouts = []
+            for file in files:
+                with open(file, encoding='utf-8') as level_file:
+                    layouts.append(json.load(level_file))
+        else:
+            # pylint: disable=import-outside-toplevel
+            from chuckie.level_data import levels
+            layouts = levels
+        write(path, layouts)
+        print(f"wrote {len(layouts)} levels to {path}")
+    elif command == 'list':
+        pack = LevelPack(path)
+        print(f"{path}: {len(pack)} levels of {pack.width}x{pack.height}")
+    else:
+        raise SystemExit(main.__doc__)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,7 +1,5 @@
-import pygame
-import os
-
 import config
+from chuckie import assets
 from chuckie.thing import Thing, DIR
 
 
@@ -14,12 +12,12 @@ class Lift(Thing):
         super().__init__('lift', level, start_tile_x, start_tile_y, direction)
 
         file = "lift-left.png" if direction == DIR.LEFT else "lift-right.png"
-        self.image = pygame.image.load(os.path.join('.', 'images', file)).convert()
+        self.image = assets.image(file)
 
         if config.debug_lifts:
             print(f"putting a lift at [{start_tile_x}, {start_tile_y}]")
 
-        self.init_rect(self.image, start_tile_x, start_tile_y)
+        self.init_rect(self.image)
         return
 
     def __str__(self):
@@ -0,0 +1,100 @@
+"""
+This module contains the movement rules for Harry and the Hens, and the
+NavigationTable class, which compiles those rules for every tile of a
+level so that movement decisions become a table lookup.
+
+Each rule takes an element_at(tx, ty) function, returning the name of the
+element at a tile (or None), so the same rules can be run against the
+static layout when compiling, or against the live level when lifts are
+nearby.
+"""
+from typing import Callable, List, Optional, Tuple
+
+ElementAt = Callable[[int, int], Optional[str]]
+
+
+def harry_moves(element_at: ElementAt, tx: int, ty: int) -> Tuple[bool, bool, bool, bool]:
+    """
+    Returns a tuple of bools, that denote if Harry can go up, down, left
+    or right, in that order, from tile (tx, ty).
+    """
+    moves = [False, False, False, False]
+
+    current_element = element_at(tx, ty)
+    under_left_element = element_at(tx-1, ty+1)
+    under_right_element = element_at(tx+1, ty+1)
+
+    def not_landable(element):
+        return element in (None, 'grain', 'egg')
+
+    # allow go-up if above tile is a ladder
+    if element_at(tx, ty-2) == 'ladder':
+        moves[0] = True
+
+    # allow go-down if the underneath tile is a ladder.
+    if element_at(tx, ty+1) == 'ladder':
+        moves[1] = True
+
+    # if we're on a ladder, moving sideways isn't allowed, unless we're on
+    # a landable-ladder tile (i.e. one flanked by 'floor' tiles).
+    if current_element == 'ladder':
+        if under_left_element == 'floor':
+            moves[2] = True
+        if under_right_element == 'floor':
+            moves[3] = True
+
+        if under_left_element == 'floor' and not_landable(under_right_element):
+            moves[3] = True
+        if under_right_element == 'floor' and not_landable(under_left_element):
+            moves[2] = True
+    else:
+        # if we're not on a ladder, so we can go left or right unless
+        # there's a step in the way.
+        moves[2] = element_at(tx-1, ty) != 'floor'
+        moves[3] = element_at(tx+1, ty) != 'floor'
+
+    return moves[0], moves[1], moves[2], moves[3]
+
+
+def hen_moves(element_at: ElementAt, tx: int, ty: int) -> Tuple[bool, bool, bool, bool]:
+    """
+    Returns a tuple of bools, that denote if a Hen can go up, down, left
+    or right, in that order, from tile (tx, ty).
+    """
+    return (element_at(tx, ty - 2) == 'ladder',
+            element_at(tx, ty + 1) == 'ladder',
+            element_at(tx - 1, ty + 1) in ('floor', 'ladder'),
+            element_at(tx + 1, ty + 1) in ('floor', 'ladder'))
+
+
+def is_landable_ladder(element_at: ElementAt, tx: int, ty: int) -> bool:
+    """
+    A landable-ladder tile, is one that is flanked on either side by a floor
+    tile, so can be considered 'at floor level'.
+    """
+    return element_at(tx - 1, ty) == 'floor' or element_at(tx + 1, ty) == 'floor'
+
+
+class NavigationTable:
+    """
+    The moves allowed from every tile of a level, compiled once from the
+    static layout.  Eggs and grain never block movement, so consuming them
+    doesn't invalidate the table; lifts do, so the Level only consults the
+    table away from lift columns.
+    """
+    def __init__(self, width: int, height: int, element_at: ElementAt):
+        self.width = width
+        self.height = height
+        self.harry: List[List[Tuple[bool, ...]]] = []
+        self.hen: List[List[Tuple[bool, ...]]] = []
+        self.landable_ladder: List[List[bool]] = []
+
+        for ty in range(height):
+            self.harry.append([harry_moves(element_at, tx, ty) for tx in range(width)])
+            self.hen.append([hen_moves(element_at, tx, ty) for tx in range(width)])
+            self.landable_ladder.append([is_landable_ladder(element_at, tx, ty)
+                                         for tx in range(width)])
+        return
+
+    def contains(self, tx: int, ty: int) -> bool:
+        return 0 <= tx < self.width and 0 <= ty < self.height
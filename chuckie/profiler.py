@@ -0,0 +1,156 @@
+"""
+This module captures a profile of the running game, over a set number of
+main loop frames, so the gameplay that matters can be profiled on its own
+rather than the whole process, waits for key presses and all.
+
+A capture is started with F4 in game, or from the command line with
+--profile N, and stops after N frames (or on F4 again).  It writes:
+
+* <prefix>-<phase>.pstats - cProfile stats for each game phase seen, for
+  pstats, snakeviz and the like.
+* <prefix>.collapsed - stacks sampled every config.profile_sample_ms, one
+  'phase;outer;...;inner count' line per distinct stack, as read by
+  flamegraph.pl, speedscope and inferno.
+
+Each is labelled by the game phase it was taken in: 'menu' (the high score
+and name entry screens), 'get_ready', 'play' and 'bonus' (counting the
+end of level bonus).  The main loop calls set_phase() as it moves between
+them, and frame() once per frame.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import config
+
+_phase = 'menu'
+_capture = None
+
+PHASES = ('menu', 'get_ready', 'play', 'bonus')
+
+
+class Capture:
+    """
+    One profile capture: a cProfile.Profile per phase, and a thread
+    sampling the main thread's stack.
+    """
+    def __init__(self, frames: int, prefix: str):
+        """
+        :param frames: main loop frames to capture for.
+        :param prefix: path prefix of the files written.
+        """
+        self.frames_left = frames
+        self.prefix = prefix
+        self.profiles = {}
+        self.stacks = Counter()
+        self._profile = None
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        # the sampler needs the GIL to take a sample, so have the main thread
+        # hand it over more often than the default 5ms, otherwise samples are
+        # only taken while the main thread is waiting.
+        sys.setswitchinterval(min(self._switch_interval, config.profile_sample_ms / 4000))
+        self._switch(_phase)
+        self._sampler.start()
+
+    def _switch(self, phase: str) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        self._profile = self.profiles.setdefault(phase, cProfile.Profile())
+        self._profile.enable()
+
+    def _sample(self) -> None:
+        interval = config.profile_sample_ms / 1000
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(_phase)
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self) -> list:
+        """
+        Stop capturing, and write the files.
+        :return: the paths written.
+        """
+        self._profile.disable()
+        self._stop.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+
+        paths = []
+        for phase, profile in self.profiles.items():
+            path = f"{self.prefix}-{phase}.pstats"
+            profile.dump_stats(path)
+            paths.append(path)
+
+        path = f"{self.prefix}.collapsed"
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        paths.append(path)
+        return paths
+
+
+def set_phase(phase: str) -> None:
+    """
+    Tell the profiler the game has moved into a new phase, one of PHASES.
+    """
+    global _phase  # pylint: disable=global-statement
+    if phase != _phase:
+        _phase = phase
+        if _capture:
+            _capture._switch(phase)  # pylint: disable=protected-access
+
+
+def start(frames: int = None, prefix: str = None) -> None:
+    """
+    Start a capture, if one isn't already running.
+    :param frames: main loop frames to capture, default config.profile_frames.
+    :param prefix: path prefix of the files written, by default
+    config.profile_prefix and the time the capture started.
+    """
+    global _capture  # pylint: disable=global-statement
+    if _capture:
+        return
+    prefix = prefix or f"{config.profile_prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+    _capture = Capture(frames or config.profile_frames, prefix)
+    _capture.start()
+    print(f"profiling {_capture.frames_left} frames...")
+
+
+def stop() -> None:
+    """
+    Stop the running capture, if any, and write its files.
+    """
+    global _capture  # pylint: disable=global-statement
+    if _capture:
+        capture, _capture = _capture, None
+        print(f"profile written to {', '.join(capture.stop())}")
+
+
+def toggle() -> None:
+    if _capture:
+        stop()
+    else:
+        start()
+
+
+def frame() -> None:
+    """
+    Count a main loop frame, stopping the capture after its last frame.
+    """
+    if _capture:
+        _capture.frames_left -= 1
+        if _capture.frames_left <= 0:
+            stop()
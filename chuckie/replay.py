@@ -0,0 +1,252 @@
+"""
+This module records the keys held down on every simulation step into a
+compact binary log, and replays those logs back through a Simulation,
+either as fast as possible or at normal speed in a window.
+
+Game time is counted in simulation steps, so the log doesn't need to hold
+the half second ticks; replaying the same steps gives the same ticks.
+
+The log format is a header followed by run-length encoded key states:
+
+    magic 'CHKR', version (u8), starting level (u8), seed (i64), steps (u32)
+    pack path length (u16), then if it isn't 0:
+        pack path (utf-8), the pack's SHA-256 (32 bytes)
+    then repeated: key state (u8), run length (unsigned LEB128 varint)
+
+The pack is the level pack the game was played on, see
+chuckie/level_pack.py, with no path for the levels that ship with the
+game.  Replaying checks the pack hasn't changed since.  Version 1 logs,
+which have no pack fields, are still read.
+
+Each key state packs w, s, a, d, space and pause into one byte, so a
+second of play costs a few bytes.
+"""
+import struct
+import sys
+from typing import List, Tuple
+
+import config
+from chuckie.controls import Controls
+
+MAGIC = b'CHKR'
+VERSION = 2
+HEADER = struct.Struct('<4sBBqI')
+PACK_PATH = struct.Struct('<H')
+DIGEST_SIZE = 32
+
+W, S, A, D, SPACE, PAUSED = 1, 2, 4, 8, 16, 32
+
+
+def pack_controls(ctrls: Controls) -> int:
+    """
+    Packs the state of the keys into the bits of a single byte.
+    """
+    return (W if ctrls.w_down else 0) \
+        | (S if ctrls.s_down else 0) \
+        | (A if ctrls.a_down else 0) \
+        | (D if ctrls.d_down else 0) \
+        | (SPACE if ctrls.space_down else 0) \
+        | (PAUSED if ctrls.paused else 0)
+
+
+def unpack_controls(state: int, ctrls: Controls) -> Controls:
+    """
+    Sets the keys of ctrls from a byte made by pack_controls().
+    """
+    ctrls.w_down = bool(state & W)
+    ctrls.s_down = bool(state & S)
+    ctrls.a_down = bool(state & A)
+    ctrls.d_down = bool(state & D)
+    ctrls.space_down = bool(state & SPACE)
+    ctrls.paused = bool(state & PAUSED)
+    return ctrls
+
+
+class Recording:
+    """
+    The keys held down on each step of one game, with the seed, level and
+    level pack needed to play it out again.  Key states are held run-length
+    encoded, as [state, count] pairs.
+    """
+    def __init__(self, seed: int, starting_level: int = config.starting_level,
+                 pack: str = None, digest: bytes = None):
+        """
+        :param pack: the path of the level pack played, None for the levels
+        that ship with the game.
+        :param digest: the pack's LevelPack.digest().
+        """
+        self.seed = seed
+        self.starting_level = starting_level
+        self.pack = pack
+        self.digest = digest
+        self.runs: List[List[int]] = []
+        self.steps = 0
+
+    def record(self, ctrls: Controls) -> None:
+        """
+        Add the keys held down for one step, call this before the step runs.
+        """
+        state = pack_controls(ctrls)
+        if self.runs and self.runs[-1][0] == state:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([state, 1])
+        self.steps += 1
+
+    def states(self):
+        """
+        Yields the packed key state for each step in turn.
+        """
+        for state, count in self.runs:
+            for _ in range(count):
+                yield state
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.starting_level, self.seed, self.steps))
+        pack = self.pack.encode('utf-8') if self.pack else b''
+        out += PACK_PATH.pack(len(pack))
+        if pack:
+            out += pack + self.digest
+        for state, count in self.runs:
+            out.append(state)
+            while True:
+                byte = count & 0x7f
+                count >>= 7
+                if count:
+                    out.append(byte | 0x80)
+                else:
+                    out.append(byte)
+                    break
+        return bytes(out)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Recording':
+        magic, version, starting_level, seed, steps = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("not a ChuckieEgg recording")
+
+        recording = Recording(seed, starting_level)
+        pos = HEADER.size
+        if version >= 2:
+            (length,) = PACK_PATH.unpack_from(data, pos)
+            pos += PACK_PATH.size
+            if length:
+                recording.pack = data[pos:pos + length].decode('utf-8')
+                recording.digest = data[pos + length:pos + length + DIGEST_SIZE]
+                pos += length + DIGEST_SIZE
+        while pos < len(data):
+            state = data[pos]
+            pos += 1
+            count, shift = 0, 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                count |= (byte & 0x7f) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+            recording.runs.append([state, count])
+            recording.steps += count
+
+        if recording.steps != steps:
+            raise ValueError(f"recording is truncated, {recording.steps} of {steps} steps")
+        return recording
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @staticmethod
+    def load(path: str) -> 'Recording':
+        with open(path, 'rb') as file:
+            return Recording.from_bytes(file.read())
+
+
+def recording_levels(recording: Recording, pack: str = None):
+    """
+    Open the level pack a recording was played on, checking it hasn't
+    changed since.
+    :param pack: where the pack is now, if it's moved, None to use the
+    path in the recording.
+    :return: the LevelPack, or None for the levels that ship with the game.
+    """
+    if not recording.pack:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from chuckie.level_pack import LevelPack
+
+    levels = LevelPack(pack or recording.pack)
+    if levels.digest() != recording.digest:
+        raise ValueError(f"{levels.path} isn't the level pack the recording was made on, "
+                         f"{recording.pack}")
+    return levels
+
+
+def replay(recording: Recording, window=None, clock=None, pack: str = None):
+    """
+    Feed a recording back through a new Simulation, on the levels it was
+    played on.  Without a window the steps run back to back, as fast as the
+    CPU allows; with a window each step is drawn, paced by clock at
+    config.fps.
+    :param pack: where the recording's level pack is now, if it's moved.
+    :return: the Simulation, as it was after the last step.
+    """
+    # pylint: disable=import-outside-toplevel
+    from chuckie.simulation import Simulation
+
+    sim = Simulation(recording.starting_level, recording_levels(recording, pack),
+                     seed=recording.seed)
+    ctrls = Controls()
+    for state in recording.states():
+        sim.step(unpack_controls(state, ctrls))
+        if window is not None:
+            _draw(sim, window, clock)
+        if sim.done:
+            break
+    return sim
+
+
+def _draw(sim, window, clock) -> None:
+    # pylint: disable=import-outside-toplevel
+    import pygame
+
+    dirty = sim.level.clear(window)
+    dirty += sim.status.draw(window)
+    dirty += sim.level.draw(window)
+    pygame.display.update(dirty)
+    pygame.event.pump()
+    if clock:
+        clock.tick(config.fps)
+
+
+def main(argv: List[str]) -> Tuple[int, int]:
+    """
+    python -m chuckie.replay FILE [--fast] [--levels PACK]
+    """
+    fast = '--fast' in argv
+    pack = None
+    if '--levels' in argv:
+        index = argv.index('--levels')
+        pack = argv[index + 1]
+        argv = argv[:index] + argv[index + 2:]
+    recording = Recording.load([arg for arg in argv if arg != '--fast'][0])
+
+    window = clock = None
+    if fast:
+        config.headless = True
+    else:
+        # pylint: disable=import-outside-toplevel
+        import pygame
+        window = pygame.display.set_mode([config.window_width, config.window_height])
+        pygame.display.set_caption("nerdSezzer - ChuckieEgg 2023! (replay)")
+        pygame.init()
+        pygame.mixer.init()
+        clock = pygame.time.Clock()
+
+    sim = replay(recording, window, clock, pack)
+    print(f"replayed {sim.frame} of {recording.steps} steps: {sim.status!r}")
+    return sim.frame, sim.status.game_score
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
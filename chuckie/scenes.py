@@ -0,0 +1,382 @@
+"""
+This module contains the game's screens, as scenes driven by the one main
+loop in chuckie_egg.py: the high scores, 'well done' name entry, 'Get
+Ready', the end of level bonus, and play itself.
+
+Each frame the main loop hands the current scene the frame's events and
+the milliseconds since the last frame, via update(), which returns the
+scene for the next frame (itself, to carry on), then calls draw(), which
+returns the rects of the window that changed.  No scene waits, sleeps or
+pumps events of its own, so background work, like loading the next game
+or building the next level, carries on underneath every screen.
+"""
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+
+# pylint: disable=import-error
+import pygame
+
+import config
+from chuckie import assets
+from chuckie.controls import Controls
+from chuckie.frame_timer import FrameTimer
+from chuckie.high_scores import HighScores
+from chuckie.level_pack import LevelPack
+from chuckie.simulation import Simulation, OUTCOME
+
+SKIP_KEYS = (pygame.K_SPACE, pygame.K_RETURN)
+
+
+class Game:
+    """
+    What the scenes share: the window, the high scores, the Simulation
+    being played and its controls, and the executor background work runs
+    on.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, window: pygame.Surface, high_scores: HighScores, loader: Executor,
+                 timer: FrameTimer, seed: int = None, record: str = None, levels=None):
+        """
+        :param seed: seed for every game, None for a different game each time.
+        :param record: path to record each game's key presses to, or None;
+        each game gets its own file, numbered from 1 before the extension,
+        so game.chkr gives game-1.chkr, game-2.chkr and so on.
+        :param levels: the levels to play, None for the built in ones.
+        """
+        self.window = window
+        self.high_scores = high_scores
+        self.loader = loader
+        self.timer = timer
+        self.seed = seed
+        self.record = record
+        self.levels = levels
+        self.sim = None
+        self.ctrls = Controls()
+        self.recording = None
+        self.games = 0
+        self.loading = None
+
+    def load(self) -> None:
+        """
+        Start creating the next game, in the background.
+        """
+        self.loading = self.loader.submit(self._new_simulation)
+
+    def _new_simulation(self) -> Simulation:
+        # not every level has lifts, and nobody's died yet; decode them now
+        # rather than part way through a game.
+        for file in ('lift-left.png', 'lift-right.png'):
+            assets.image(file)
+        assets.sound('opps.wav')
+        sim = Simulation(config.starting_level, self.levels, auto_advance=False, seed=self.seed)
+        sim.timer = self.timer
+        return sim
+
+    def start(self) -> None:
+        """
+        Swap in the game load() created, waiting for it if need be.
+        """
+        self.sim = self.loading.result()
+        self.loading = None
+        self.ctrls = Controls()
+        self.games += 1
+        if self.record:
+            # pylint: disable=import-outside-toplevel
+            from chuckie.replay import Recording
+            pack = digest = None
+            if isinstance(self.levels, LevelPack):
+                pack, digest = os.path.abspath(self.levels.path), self.levels.digest()
+            self.recording = Recording(self.sim.seed, self.sim.starting_level, pack, digest)
+
+    def save_recording(self) -> None:
+        """
+        Save the current game's recording, if it hasn't been already.
+        """
+        if self.recording and self.recording.steps:
+            root, extension = os.path.splitext(self.record)
+            path = f"{root}-{self.games}{extension}"
+            self.recording.save(path)
+            print(f"recorded game {self.games} to {path}")
+        self.recording = None
+
+    def game_over(self) -> 'Scene':
+        """
+        Save the recording, start loading the next game, and on to entering
+        a name, or straight to the high scores.
+        """
+        self.save_recording()
+        self.load()
+        score = self.sim.status.game_score
+        level = min(self.sim.status.game_level, len(self.sim.levels) - 1)
+        if self.high_scores.is_high_score(score):
+            return WellDoneScene(self, score, level)
+        return HighScoresScene(self)
+
+
+class Scene(ABC):
+    """
+    The base class for all scenes.  phase labels the scene for the
+    profiler, timed says whether the frame timer records its frames.
+    """
+    phase = 'menu'
+    timed = False
+
+    def __init__(self, game: Game):
+        self.game = game
+        self._repaint = True
+
+    @abstractmethod
+    def update(self, events: list, elapsed_ms: float) -> 'Scene':
+        """
+        :param events: the events since the last frame.
+        :param elapsed_ms: the time since the last frame.
+        :return: the scene for the next frame, self to carry on.
+        """
+
+    @abstractmethod
+    def draw(self, window: pygame.Surface) -> list:
+        """
+        :return: the list of rects that changed.
+        """
+
+    def _first_draw(self) -> bool:
+        """ True the first time it's called, when the whole window needs painting. """
+        repaint, self._repaint = self._repaint, False
+        return repaint
+
+
+class HighScoresScene(Scene):
+    """
+    Shows the high scores until 'S' is pressed, then starts the game as soon
+    as it has loaded.
+    """
+    def __init__(self, game: Game):
+        super().__init__(game)
+        self._starting = False
+
+    def update(self, events: list, elapsed_ms: float) -> Scene:
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == ord('s'):
+                self._starting = True
+        if self._starting and self.game.loading.done():
+            self.game.start()
+            return PlayScene(self.game)
+        return self
+
+    def draw(self, window: pygame.Surface) -> list:
+        if self._first_draw():
+            self.game.high_scores.draw()
+            return [window.get_rect()]
+        return []
+
+
+class WellDoneScene(Scene):
+    """
+    Asks for the player's name, Return adds it and their score to the high
+    scores, Esc skips.
+    """
+    MAX_NAME = 16
+
+    def __init__(self, game: Game, score: int, level: int):
+        super().__init__(game)
+        self.score = score
+        self.level = level
+        self.name = ""
+        self._name_changed = False
+
+    def update(self, events: list, elapsed_ms: float) -> Scene:
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_ESCAPE:
+                return HighScoresScene(self.game)
+            if event.key == pygame.K_RETURN:
+                if self.name:
+                    self.game.high_scores.add_new_score(self.name, self.score, self.level)
+                return HighScoresScene(self.game)
+            if event.key == pygame.K_BACKSPACE:
+                self.name = self.name[:-1]
+                self._name_changed = True
+            elif event.unicode and event.unicode.isprintable() and len(self.name) < WellDoneScene.MAX_NAME:
+                self.name += event.unicode
+                self._name_changed = True
+        return self
+
+    def draw(self, window: pygame.Surface) -> list:
+        if self._first_draw():
+            self.game.high_scores.draw_well_done(self.name)
+            return [window.get_rect()]
+        if self._name_changed:
+            self._name_changed = False
+            return [self.game.high_scores.draw_name(self.name)]
+        return []
+
+
+class GetReadyScene(Scene):
+    """
+    The 'Get Ready' screen, before each life; any of SKIP_KEYS skips it.
+    Harry's keys are still tracked while it shows.
+    """
+    phase = 'get_ready'
+    DURATION_MS = 2500
+    _screen = None
+
+    def __init__(self, game: Game):
+        super().__init__(game)
+        self._left_ms = GetReadyScene.DURATION_MS
+
+    def update(self, events: list, elapsed_ms: float) -> Scene:
+        self._left_ms -= elapsed_ms
+        skips = [event for event in events if event.type == pygame.KEYDOWN and event.key in SKIP_KEYS]
+        # the controls carry on into play, so keys pressed or let go while
+        # waiting still count.
+        self.game.ctrls.process_events([event for event in events if event not in skips],
+                                       timed=False)
+        if skips or self._left_ms <= 0:
+            return PlayScene(self.game)
+        return self
+
+    def draw(self, window: pygame.Surface) -> list:
+        if not self._first_draw():
+            return []
+        if GetReadyScene._screen is None:
+            GetReadyScene._screen = GetReadyScene._render(window)
+        window.blit(GetReadyScene._screen, (0, 0))
+        return [window.get_rect()]
+
+    @staticmethod
+    def _render(window: pygame.Surface) -> pygame.Surface:
+        """
+        Pre-render the 'Get Ready' screen, it never changes.
+        """
+        font = assets.font(36)
+        surface = pygame.Surface(window.get_size()).convert()
+        surface.fill([0, 0, 0])
+
+        text_surface = font.render("Get Ready", False, pygame.color.Color('yellow'))
+        x = (surface.get_width()-text_surface.get_width()) // 2
+        surface.blit(text_surface, (x, 420))
+
+        text_surface = font.render("Player 1", False, pygame.color.Color('cyan'))
+        x = (surface.get_width()-text_surface.get_width()) // 2
+        surface.blit(text_surface, (x, 480))
+        return surface
+
+
+class BonusScene(Scene):
+    """
+    The end of level bonus, counted into the score a tenth per step, then a
+    pause on a blank level before the next one.  The next level is built in
+    the background meanwhile.  Any of SKIP_KEYS counts the rest at once.
+    """
+    phase = 'bonus'
+    PAUSE_STEPS = 21
+
+    def __init__(self, game: Game):
+        super().__init__(game)
+        self._step_ms = 1000 / config.fps
+        self._accumulator = 0.0
+        self._count = game.sim.status.game_bonus // 10
+        self._pause_left = BonusScene.PAUSE_STEPS
+        self._blanked = False
+        game.sim.prepare_next_level(game.loader)
+
+    def update(self, events: list, elapsed_ms: float) -> Scene:
+        status = self.game.sim.status
+        if any(event.type == pygame.KEYDOWN and event.key in SKIP_KEYS for event in events):
+            return self._next_level()
+
+        self._accumulator += elapsed_ms
+        while self._accumulator >= self._step_ms:
+            self._accumulator -= self._step_ms
+            if status.game_bonus > 0:
+                status.count_bonus(self._count)
+            else:
+                self._pause_left -= 1
+                if self._pause_left <= 0:
+                    return self._next_level()
+        return self
+
+    def _next_level(self) -> Scene:
+        if self.game.sim.next_level() == OUTCOME.GAME_COMPLETE:
+            return self.game.game_over()
+        self.game.ctrls = Controls()
+        return GetReadyScene(self.game)
+
+    def draw(self, window: pygame.Surface) -> list:
+        sim = self.game.sim
+        if self._first_draw():
+            sim.level.redraw()
+            sim.level.clear(window)
+            sim.status.draw(window)
+            sim.level.draw(window)
+            return [window.get_rect()]
+        if sim.status.game_bonus <= 0 and not self._blanked:
+            self._blanked = True
+            window.fill([0, 0, 0])
+            sim.status.redraw()
+            sim.status.draw(window)
+            return [window.get_rect()]
+        return sim.status.draw(window)
+
+
+class PlayScene(Scene):
+    """
+    Play: the Simulation steps at a fixed config.fps steps per second,
+    however long each rendered frame takes, and the moving sprites are
+    drawn interpolated between steps.
+    """
+    phase = 'play'
+    timed = True
+
+    def __init__(self, game: Game):
+        super().__init__(game)
+        self._step_ms = 1000 / config.fps
+        self._accumulator = 0.0
+        self._showing_frame_times = config.show_frame_times
+
+    def update(self, events: list, elapsed_ms: float) -> Scene:
+        game = self.game
+        timer = game.timer
+        self._accumulator = min(self._accumulator + elapsed_ms,
+                                config.max_catch_up_steps * self._step_ms)
+
+        game.ctrls.process_events(events)
+        timer.lap('events')
+        while self._accumulator >= self._step_ms:
+            self._accumulator -= self._step_ms
+            if game.recording:
+                game.recording.record(game.ctrls)
+            outcome = game.sim.step(game.ctrls)
+            game.ctrls.stepped()
+            if outcome == OUTCOME.PLAYING:
+                continue
+
+            if outcome in (OUTCOME.DIED, OUTCOME.GAME_OVER):
+                assets.sound('opps.wav').play()
+            # the level has been reset, if there are lives left.
+            if outcome == OUTCOME.DIED:
+                return GetReadyScene(game)
+            if outcome == OUTCOME.LEVEL_COMPLETE:
+                return BonusScene(game)
+            return game.game_over()
+        return self
+
+    def draw(self, window: pygame.Surface) -> list:
+        sim = self.game.sim
+        timer = self.game.timer
+        if self._first_draw() or (self._showing_frame_times and not config.show_frame_times):
+            sim.level.redraw()
+        self._showing_frame_times = config.show_frame_times
+
+        # only push the regions that changed.
+        dirty = sim.level.clear(window)
+        timer.lap('level_draw')
+        dirty += sim.status.draw(window)
+        timer.lap('hud_draw')
+        dirty += sim.level.draw(window, self._accumulator / self._step_ms)
+        timer.lap('level_draw')
+        if self._showing_frame_times:
+            dirty += timer.draw(window)
+        return dirty
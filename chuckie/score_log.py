@@ -0,0 +1,126 @@
+"""
+This module keeps the high scores on disk, as an append-only log of every
+score entered, one per line:
+
+    score<TAB>level<TAB>name
+
+where level is blank if it isn't known.
+
+Names are typed on the 'well done' screen, so they never hold a tab or a
+newline.  The log is read once, in one go, when the game starts.  Appends
+happen on a background thread, so the game never waits on the disk.  A
+line that's only partly written, by a crash, is skipped when loading.
+
+Once the log holds more than twice config.high_scores_kept lines for a
+level it's compacted, on the same thread, down to the best
+config.high_scores_kept scores for each level reached, which includes the
+best config.high_scores_kept of all: they're written to a temporary file
+which is then renamed over the log, so the log is never left half
+written.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import config
+
+Record = Tuple[str, int, Optional[int]]
+""" name, score and the (zero based) level reached, None if not known. """
+
+
+class ScoreLog:
+    """
+    The high scores log file.
+    """
+    def __init__(self, path: str = config.high_scores_file, keep: int = config.high_scores_kept):
+        """
+        :param path: the log file, created on the first append.
+        :param keep: the number of scores compaction keeps.
+        """
+        self.path = path
+        self.keep = keep
+        self.records: List[Record] = []
+        """ self.records are the scores in the log, in the order entered. """
+        self._lines = Counter()
+        """ self._lines counts the lines in the log for each level. """
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='score_log')
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read().decode('utf-8', errors='replace')
+        except FileNotFoundError:
+            return
+
+        # the last line only counts if its newline was written too.
+        lines = data.split('\n')
+        partial = lines.pop()
+        for line in lines:
+            fields = line.split('\t', 2)
+            if len(fields) != 3:
+                continue
+            try:
+                level = int(fields[1]) if fields[1] else None
+                self.records.append((fields[2], int(fields[0]), level))
+            except ValueError:
+                continue
+        self._lines.update(level for _, _, level in self.records)
+
+        # a crash part way through an append leaves a line without its
+        # newline, rewrite the log so the next append starts a line.
+        if partial:
+            self._writer.submit(self._compact, list(self.records))
+
+    def append(self, name: str, score: int, level: int = None) -> None:
+        """
+        Add a score to the log, it's written in the background.
+        """
+        record = (name, score, level)
+        self.records.append(record)
+        self._writer.submit(self._append, record)
+
+        self._lines[level] += 1
+        if self._lines[level] > 2 * self.keep:
+            self.records = self.best()
+            self._lines = Counter(level for _, _, level in self.records)
+            self._writer.submit(self._compact, list(self.records))
+
+    def best(self) -> List[Record]:
+        """
+        The best config.high_scores_kept scores for each level reached,
+        highest first, earliest first where scores tie.
+        """
+        kept = Counter()
+        best = []
+        for record in sorted(self.records, key=lambda record: -record[1]):
+            if kept[record[2]] < self.keep:
+                kept[record[2]] += 1
+                best.append(record)
+        return best
+
+    @staticmethod
+    def _line(record: Record) -> str:
+        name, score, level = record
+        return f"{score}\t{'' if level is None else level}\t{name}\n"
+
+    def _append(self, record: Record) -> None:
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(ScoreLog._line(record))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _compact(self, records: List[Record]) -> None:
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as file:
+            file.writelines(ScoreLog._line(record) for record in records)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, self.path)
+
+    def flush(self) -> None:
+        """
+        Wait for every write so far to reach the disk.
+        """
+        self._writer.submit(lambda: None).result()
@@ -0,0 +1,192 @@
+"""
+This module contains the Simulation class, which runs the game core: the
+Level, Harry, the Hens, the Lifts and the Status, one frame at a time,
+with no window, no audio and no rendering.
+
+Set config.headless to True before creating a Simulation, so sprites
+skip converting their images to the display format and sounds are
+silent.  Each call to step() is one game frame, or one tick of the
+fixed-timestep clock when the game is being played in a window.
+"""
+from concurrent.futures import Executor
+from enum import Enum
+from random import Random
+
+import config
+from chuckie.controls import Controls
+from chuckie.frame_timer import NullTimer
+from chuckie.level import Level
+from chuckie.status import Status
+
+
+class OUTCOME(Enum):
+    """
+    An Enum class to specify what happened during a Simulation step:
+    PLAYING, DIED, LEVEL_COMPLETE, GAME_OVER and GAME_COMPLETE.
+    """
+    PLAYING = 1
+    DIED = 2
+    LEVEL_COMPLETE = 3
+    GAME_OVER = 4
+    GAME_COMPLETE = 5
+
+
+class Simulation:
+    """
+    Runs a single game, from the starting level until Harry runs out of
+    lives or every level has been completed.
+    """
+    TICKS_PER_HALF_SECOND = config.fps // 2
+    """ Game time ticks down every half second, that's this many frames. """
+
+    def __init__(self, starting_level: int = config.starting_level, level_list=None,
+                 auto_advance: bool = True, seed=None):
+        """
+        :param starting_level: zero based index of the first level to play.
+        :param level_list: the levels to play, any sequence of level_data
+        style layouts or CompiledLevels, such as a
+        chuckie.level_pack.LevelPack, defaults to level_data.levels.
+        :param auto_advance: if True, a completed level's bonus is counted
+        and the next level loaded within step(), otherwise step() returns
+        LEVEL_COMPLETE and waits for next_level() to be called.
+        :param seed: seeds every level's random stream, None to use
+        config.random_seed.  The same seed and controls always play out
+        the same game.
+        """
+        if level_list is None:
+            # pylint: disable=import-outside-toplevel
+            from chuckie.level_data import levels as level_list
+        self.levels = level_list
+        self.auto_advance = auto_advance
+        self.seed = seed if seed is not None else config.random_seed
+        if self.seed is None:
+            self.seed = Random().getrandbits(63)
+        self.starting_level = starting_level
+        self.random = Random(self.seed)
+        self.status = Status()
+        self.status.game_level = starting_level
+        self.controls = Controls()
+        self.controls.paused = False
+        self.frame = 0
+        self.tick = False
+        self.done = False
+        self._eggs_banked = 0
+        self.cause_of_death = None
+        """ self.cause_of_death is the reason the last life was lost: 'splat',
+        'lift', 'hen' or 'time'. """
+        self.timer = NullTimer()
+        """ self.timer is told as each phase of a step ends, see
+        chuckie.frame_timer. """
+        self._next_level = None
+        self.level = self._build_level(self.status.game_level, self.random.getrandbits(64))
+        self.status.reset_new_level()
+
+    @property
+    def eggs_collected(self) -> int:
+        """ Eggs collected this game, over all levels. """
+        return self._eggs_banked + self.level.eggs_collected
+
+    def _build_level(self, index: int, seed: int) -> Level:
+        """
+        Create a level, touching nothing the current level uses, so it's
+        safe to run on another thread.
+        """
+        level = Level(self.levels[index], self.status, seed)
+        level.create()
+        return level
+
+    def prepare_next_level(self, executor: Executor) -> None:
+        """
+        Start building the next level on executor, for example while the
+        bonus and 'Get Ready' screens are showing, for next_level() to swap
+        in when it's called.
+        """
+        index = self.status.game_level + 1
+        if self._next_level is None and index < len(self.levels):
+            self._next_level = executor.submit(self._build_level, index, self.random.getrandbits(64))
+
+    def check_death(self):
+        """
+        Move Harry, then check to see if he died.
+        :return: the cause of death, or None if Harry is still alive.
+        """
+        alive = self.level.harry.move(self.controls)
+        self.timer.lap('harry')
+        if not alive:
+            return 'splat'
+        if self.level.check_lift_death():
+            return 'lift'
+        if self.level.check_collision():
+            return 'hen'
+        if self.status.is_time_up():
+            return 'time'
+        return None
+
+    def step(self, controls: Controls = None) -> OUTCOME:
+        """
+        Advance the game by one frame.
+        :param controls: the keys held down this frame, if None the
+        Simulation's own Controls instance is used.
+        :return: what happened during the frame.
+        """
+        if self.done:
+            return OUTCOME.GAME_OVER
+        if controls is not None:
+            self.controls = controls
+
+        self.frame += 1
+        self.level.snapshot()
+        if self.frame % Simulation.TICKS_PER_HALF_SECOND == 0:
+            self.status.time_tick(self.controls.paused)
+        if self.controls.paused:
+            return OUTCOME.PLAYING
+
+        self.tick = self.level.update_hens(self.tick)
+        self.level.update_lifts()
+        self.timer.lap('hens_lifts')
+
+        self.cause_of_death = self.check_death()
+        self.timer.lap('collisions')
+        if self.cause_of_death:
+            if self.status.on_harry_died():
+                self.level.reset()
+                return OUTCOME.DIED
+            self.done = True
+            return OUTCOME.GAME_OVER
+
+        if self.level.are_all_eggs_collected():
+            if self.auto_advance:
+                return self.next_level()
+            return OUTCOME.LEVEL_COMPLETE
+
+        return OUTCOME.PLAYING
+
+    def next_level(self) -> OUTCOME:
+        """
+        Count any bonus left into the score, then unload the completed level
+        and swap in the next one, waiting for it if prepare_next_level()
+        hasn't finished building it yet.
+        :return: LEVEL_COMPLETE, or GAME_COMPLETE if that was the last level.
+        """
+        step = self.status.game_bonus // 10
+        while self.status.game_bonus > 0:
+            self.status.count_bonus(step)
+        self.level.unload()
+
+        self.status.game_level += 1
+        if self.status.game_level >= len(self.levels):
+            self.done = True
+            return OUTCOME.GAME_COMPLETE
+
+        if self._next_level is not None:
+            level = self._next_level.result()
+            self._next_level = None
+        else:
+            level = self._build_level(self.status.game_level, self.random.getrandbits(64))
+
+        self._eggs_banked += self.level.eggs_collected
+        self.controls = Controls()
+        self.controls.paused = False
+        self.level = level
+        self.status.reset_new_level()
+        return OUTCOME.LEVEL_COMPLETE
@@ -1,8 +1,7 @@
 import pygame
-import pygame.font
-import os
 
 import config
+from chuckie import assets
 from chuckie.utils import tile_to_real
 
 
@@ -30,20 +29,24 @@ class Status:
         self._bottom_level_tile = 4
         self._start_left = 1
 
-        pygame.font.init()
-        self._font = pygame.font.Font(os.path.join('.', 'resources', config.font_name), 36)
+        self._font = assets.font(36)
         self._colour = (255, 165, 0)
+        self._rendered = {}
+        self._drawn = None
+
+        # the area of the window the HUD repaints, when it changes.
+        (_, top) = tile_to_real(self._start_left, self._top_level_tile)
+        (_, bottom) = tile_to_real(self._start_left, self._bottom_level_tile)
+        self.rect = pygame.Rect(0, top, config.window_width, bottom + self._font.get_linesize() - top)
 
         self.icons = pygame.sprite.Group()
-        self.img = pygame.image.load(os.path.join('.', 'images', 'hat.png')).convert()
-        self.img.convert_alpha()
-        self.img.set_colorkey((0, 0, 0))
+        self.img = assets.image('hat.png', (0, 0, 0))
         self._update_icons()
         return
 
     def _update_icons(self):
         # work out the width of the work 'SCORE' in the font
-        text_surface = self._font.render("SCORE  ", False, self._colour)
+        text_surface = self._render('score_label', "SCORE  ")
 
         for i in range(0, self.game_lives):
             icon = pygame.sprite.Sprite()
@@ -55,6 +58,17 @@ class Status:
             self.icons.add(icon)
         return
 
+    def _render(self, field: str, text: str) -> pygame.Surface:
+        """
+        Returns the rendered text for a HUD field, only re-rendering it
+        when the field's text has changed since the last call.
+        """
+        cached = self._rendered.get(field)
+        if cached is None or cached[0] != text:
+            cached = (text, self._font.render(text, False, self._colour))
+            self._rendered[field] = cached
+        return cached[1]
+
     def __repr__(self):
         return f"level={self.game_level}, lives left={self.game_lives}, time={self.game_time}, " \
                f"bonus={self.game_bonus}, score={self.game_score}, paused={self.game_pause}"
@@ -125,55 +139,63 @@ class Status:
         self.icons.sprites()[-1].kill()
         return self.game_lives
 
-    def end_of_level(self, window, level, clock):
-        step = (self.game_bonus // 10)
-        while self.game_bonus > 0:
-            if self.game_bonus < step:
-                self.game_score += self.game_bonus
-                self.game_bonus = 0
-            else:
-                self.game_bonus -= step
-                self.game_score += step
+    def count_bonus(self, step: int):
+        """
+        Move one step's worth of the bonus into the score, or all of what's
+        left if that's less than a step.
+        """
+        if self.game_bonus < step or step <= 0:
+            self.game_score += self.game_bonus
+            self.game_bonus = 0
+        else:
+            self.game_bonus -= step
+            self.game_score += step
 
-            if self.game_bonus < 0:
-                self.game_bonus = 0
+        if self.game_bonus < 0:
+            self.game_bonus = 0
 
-            self._check_score()
+        self._check_score()
+        return
 
-            window.fill([0, 0, 0])
-            self.draw(window)
-            level.draw(window)
-            pygame.display.flip()
-            clock.tick(config.fps)
+    def redraw(self):
+        """
+        Called when something else has painted over the HUD, so the next
+        draw() repaints it even if nothing has changed.
+        """
+        self._drawn = None
+        return
 
-        for i in range(0, 21):
-            window.fill([0, 0, 0])
-            self.draw(window)
-            pygame.display.flip()
-            clock.tick(config.fps)
+    def draw(self, window) -> list:
+        """
+        Repaint the HUD area, if any of its text or the lives left have
+        changed since it was last drawn.
+        :return: the list of rects that changed.
+        """
+        score = "SCORE  " + str(self.game_score).rjust(6, '0')
+        level = "LEVEL  " + str(self.game_level + 1).rjust(2, '0')
+        bonus = "BONUS  " + str(self.game_bonus).rjust(2, '0')
+        time = "TIME  " + str(int(self.game_time)).rjust(2, '0')
+        drawn = (score, level, bonus, time, len(self.icons))
+        if drawn == self._drawn:
+            return []
+        self._drawn = drawn
 
-        return
+        window.fill([0, 0, 0], self.rect)
 
-    def draw(self, window):
         (x, y) = tile_to_real(self._start_left, self._top_level_tile)
-        text_surface = self._font.render("SCORE  "+str(self.game_score).rjust(6, '0'), False, self._colour)
-        window.blit(text_surface, (x + 20, y))
+        window.blit(self._render('score', score), (x + 20, y))
 
         (x, y) = tile_to_real(self._start_left, self._bottom_level_tile)
-        text_surface = self._font.render("PLAYER  1", False, self._colour)
-        window.blit(text_surface, (x + 20, y))
+        window.blit(self._render('player', "PLAYER  1"), (x + 20, y))
 
         (x, y) = tile_to_real(self._start_left + 6, self._bottom_level_tile)
-        text_surface = self._font.render("LEVEL  " + str(self.game_level + 1).rjust(2, '0'), False, self._colour)
-        window.blit(text_surface, (x, y))
+        window.blit(self._render('level', level), (x, y))
 
         (x, y) = tile_to_real(self._start_left + 11.5, self._bottom_level_tile)
-        text_surface = self._font.render("BONUS  " + str(self.game_bonus).rjust(2, '0'), False, self._colour)
-        window.blit(text_surface, (x - 20, y))
+        window.blit(self._render('bonus', bonus), (x - 20, y))
 
         (x, y) = tile_to_real(self._start_left + 18, self._bottom_level_tile)
-        text_surface = self._font.render("TIME  " + str(int(self.game_time)).rjust(2, '0'), False, self._colour)
-        window.blit(text_surface, (x - 20, y))
+        window.blit(self._render('time', time), (x - 20, y))
 
         self.icons.draw(window)
-        return
+        return [self.rect]
@@ -47,12 +47,18 @@ class Thing(pygame.sprite.Sprite):
                  start_direction: DIR):
         pygame.sprite.Sprite.__init__(self)
         self.level = level
+        self.start_tile_x = start_tile_x
+        self.start_tile_y = start_tile_y
+        self.start_direction = start_direction
         self.x, self.y = utils.tile_to_real(start_tile_x, start_tile_y)
         self.dx = 0
         self.dy = 0
         self.y_velocity = 0
         self.name = name
         self.rect = None
+        self.previous_xy = None
+        """ self.previous_xy is where the rect was before the last
+        simulation step, used to interpolate drawing between steps. """
         self.state = STATE.WALKING
         self.direction = start_direction
         self.frame = 1
@@ -67,6 +73,23 @@ class Thing(pygame.sprite.Sprite):
         self.rect.x = self.x
         self.rect.y = self.y
 
+    def reset(self) -> None:
+        """
+        Put the Thing back to its starting tile, direction and state, so it
+        can be reused when Harry loses a life rather than recreated.
+        """
+        self.x, self.y = utils.tile_to_real(self.start_tile_x, self.start_tile_y)
+        self.dx = 0
+        self.dy = 0
+        self.y_velocity = 0
+        self.state = STATE.WALKING
+        self.direction = self.start_direction
+        self.frame = 1
+        self.previous_xy = None
+        if self.rect:
+            self.rect.x = self.x
+            self.rect.y = self.y
+
     @property
     def tx(self):
         """ tx for the central lower tile """
@@ -1,22 +1,46 @@
-import os
+import argparse
+import atexit
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+STARTED = time.perf_counter()
+
+# pylint: disable=wrong-import-position
 import pygame
-import pygame.midi
 
 import config
-from chuckie.controls import Controls
+from chuckie import profiler
+from chuckie.controls import allow_input_events
+from chuckie.frame_timer import FrameTimer
 from chuckie.high_scores import HighScores
-from chuckie.level import Level
-from chuckie.level_data import levels
-from chuckie.status import Status
+from chuckie.level_pack import LevelPack
+from chuckie.score_log import ScoreLog
 from config import tile_width, tile_height, debug_display
 
+parser = argparse.ArgumentParser(description="nerdSezzer - ChuckieEgg 2023!")
+parser.add_argument('--seed', type=int, default=config.random_seed,
+                    help="seed the hens, so every game plays out the same way")
+parser.add_argument('--record', metavar='FILE',
+                    help="record each game's key presses to its own file, FILE numbered "
+                         "from 1: game.chkr gives game-1.chkr, game-2.chkr... "
+                         "see chuckie/replay.py")
+parser.add_argument('--frame-times', metavar='FILE',
+                    help="write the time each phase of each frame took to FILE (.csv or .json) "
+                         "at exit, see chuckie/frame_timer.py")
+parser.add_argument('--profile', metavar='FRAMES', type=int,
+                    help="profile the first FRAMES frames, F4 starts or stops a profile "
+                         "in game, see chuckie/profiler.py")
+parser.add_argument('--levels', metavar='PACK',
+                    help="play the levels in the level pack PACK, see chuckie/level_pack.py")
+args = parser.parse_args()
+
 # Set up the game window
 window = pygame.display.set_mode([config.window_width, config.window_height])
 pygame.display.set_caption("nerdSezzer - ChuckieEgg 2023!")
 pygame.init()
 pygame.mixer.init()
+allow_input_events()
 
 clock = pygame.time.Clock()
 
@@ -24,112 +48,71 @@ if debug_display:
     print(f"Screen width={window.get_width()}, height={window.get_height()}")
     print(f"tile width={tile_width}, height={tile_height}")
 
-status = Status()
-ctrls = Controls()
-high_scores = HighScores(window, clock)
-
-opps = pygame.mixer.Sound(os.path.join('.', 'resources', 'opps.wav'))
-
-
-# -----------------------------------------------------------------------------
-# Util functions
-# -----------------------------------------------------------------------------
-
-def get_ready_screen():
-    delay = 40
-    font = pygame.font.Font(os.path.join('.', 'resources', config.font_name), 36)
-    window.fill([0, 0, 0])
-    while delay:
-        time.sleep(0.05)
-
-        text_surface = font.render("Get Ready", False, pygame.color.Color('yellow'))
-        x = (window.get_width()-text_surface.get_width()) // 2
-        window.blit(text_surface, (x, 420))
+high_scores = HighScores(window, ScoreLog())
 
-        text_surface = font.render("Player 1", False, pygame.color.Color('cyan'))
-        x = (window.get_width()-text_surface.get_width()) // 2
-        window.blit(text_surface, (x, 480))
+# show the high scores straight away, everything else is loaded while they
+# wait for the 'S' key.
+high_scores.draw()
+pygame.display.flip()
+print(f"first frame after {(time.perf_counter() - STARTED) * 1000:.0f}ms")
 
-        delay -= 1
-        pygame.display.flip()
-        clock.tick(config.fps)
-    return
+from chuckie.scenes import Game, HighScoresScene
 
 
 # -----------------------------------------------------------------------------
 # main loop
 # -----------------------------------------------------------------------------
 
-# Use a time to ensure more accurate ticks for the game time.
-pygame.time.set_timer(ctrls.HALF_SECOND_TICK, 500)
-
-tick = False
-
-# create level one.
-level = Level(levels[status.game_level], status)
-level.create()
-
-# display the high scores, and wait for the 'S' key to start.
-high_scores.display()
+def save_frame_times():
+    if timer.inputs:
+        latency = timer.summary()['input']
+        print(f"input latency p50={latency['p50']:.1f}ms p99={latency['p99']:.1f}ms "
+              f"over the last {min(timer.inputs, timer.size)} key presses")
+    if args.frame_times and timer.frames:
+        timer.export(args.frame_times)
+
+
+# create level one, in the background.
+timer = FrameTimer()
+loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='loader')
+levels = LevelPack(args.levels) if args.levels else None
+game = Game(window, high_scores, loader, timer, args.seed, args.record, levels)
+game.load()
+game.loading.add_done_callback(
+    lambda _: print(f"game loaded after {(time.perf_counter() - STARTED) * 1000:.0f}ms"))
+atexit.register(game.save_recording)
+atexit.register(save_frame_times)
+atexit.register(profiler.stop)
+if args.profile:
+    profiler.start(args.profile)
+
+# every screen is a scene, updated and drawn once a frame by this one loop.
+scene = HighScoresScene(game)
+scene.draw(window)
+clock.tick()
+timer.start()
 
 while True:
 
-    ctrls.process_events(status.time_tick)
-    if not ctrls.paused:
-
-        # update level's movables
-        tick = level.update_hens(tick)
-        level.update_lifts()
-
-        # update Harry's location, and check for death!
-        if not level.harry.move(ctrls) \
-                or level.check_lift_death() \
-                or level.check_collision() \
-                or status.is_time_up():
-
-            opps.play()
-
-            # check to see if there are any more lives left...
-            # ... if so, display the 'Get Ready' screen and reset the level.
-            if status.on_harry_died():
-                get_ready_screen()
-                level.reset()
-            else:
-                high_scores.update(status.game_score)
-                status.reset_game()
-
-                # recreate ctrls (to reset values), and create the next level.
-                ctrls = Controls()
-                level = Level(levels[status.game_level], status)
-                level.create()
-
-        # check we've completed the level?
-        if level.are_all_eggs_collected():
-            status.end_of_level(window, level, clock)
-            level.unload()
-
-            # have we completed the game...
-            status.game_level += 1
-            if status.game_level >= len(levels):
-                high_scores.update(status.game_score)
-                status.reset_game()
-            else:
-                # ... or just the level?
-                get_ready_screen()
-
-            # recreate ctrls (to reset values), and create the next level.
-            ctrls = Controls()
-            level = Level(levels[status.game_level], status)
-            level.create()
-
-    # normal game tick,d
-    window.fill([0, 0, 0])
-    status.draw(window)
-    level.draw(window)
-    pygame.display.flip()
-    clock.tick(config.fps)
-
-# all done.
-pygame.midi.quit()
-
-
+    elapsed = clock.get_time()
+    events = pygame.event.get()
+    for event in events:
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+
+    current = scene
+    profiler.set_phase(current.phase)
+    scene = current.update(events, elapsed)
+    dirty = scene.draw(window)
+
+    pygame.display.update(dirty)
+    for latency in game.ctrls.presented():
+        timer.record_input(latency)
+    clock.tick(config.render_fps)
+    if current.timed:
+        timer.lap('present')
+        timer.end_frame()
+    else:
+        timer.start()
+    profiler.frame()
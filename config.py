@@ -7,6 +7,15 @@ window_height = 960
 
 fps = 16
 
+#
+# the game simulation always steps at 'fps', the display is redrawn at
+# 'render_fps', with the moving sprites interpolated between steps.
+# max_catch_up_steps limits how many steps are run to catch up after a
+# slow frame.
+#
+render_fps = 60
+max_catch_up_steps = 4
+
 x_tiles = 22
 y_tiles = 22
 
@@ -73,6 +82,43 @@ debug_harry = False
 debug_hens = False
 debug_lifts = False
 
+#
+# show_frame_times, setting this to True shows the p50/p99 time of each
+# phase of the main loop on screen (F3 toggles it in game).
+# frame_times_history is the number of frames the timings are kept for.
+#
+show_frame_times = False
+frame_times_history = 600
+
+#
+# profile_frames, the number of main loop frames a profile capture (F4 in
+# game, or --profile N) runs for, sampling the stack every profile_sample_ms
+# and writing files that start with profile_prefix.
+#
+profile_frames = 600
+profile_sample_ms = 1
+profile_prefix = "profile"
+
+#
+# headless, setting this to True runs the game core with no window, no
+# audio and no rendering, as used by chuckie.simulation.
+#
+headless = False
+
+#
+# random_seed, the seed for the hens' random choices.  None means a
+# different game every time; set a number (or pass --seed) to make runs
+# reproducible.
+#
+random_seed = None
+
+#
+# high_scores_file, the log the high scores are kept in between games,
+# compaction keeps the best high_scores_kept of them.
+#
+high_scores_file = "high_scores.log"
+high_scores_kept = 100
+
 #
 # zero based index for level to load
 #